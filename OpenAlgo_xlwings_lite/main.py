@@ -8,9 +8,19 @@ cross-platform support for Windows, macOS, and Excel on the web.
 import xlwings as xw
 from xlwings import func, script, arg
 import json
+import asyncio
 import urllib.request
 import urllib.parse
+import http.client
+import socket
+import time
+import gzip
+import threading
+from collections import namedtuple, OrderedDict
 from datetime import datetime
+from functools import lru_cache
+from itertools import zip_longest
+from concurrent.futures import ThreadPoolExecutor
 
 # Optional imports with proper error handling
 try:
@@ -23,22 +33,59 @@ except ImportError:
     Any = object
     Optional = object
 
+# Probe for pandas without importing it (pandas pulls in NumPy, which slows cold start)
 try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
+    import importlib.util
+    PANDAS_AVAILABLE = importlib.util.find_spec("pandas") is not None
+except (ImportError, ValueError):
     PANDAS_AVAILABLE = False
-    pd = None
+pd = None  # Imported on first use by get_pandas()
+
+# Try to import orjson for faster JSON encoding/decoding
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
 
 # Try to import pyodide_http for WebAssembly compatibility
 try:
     import pyodide_http
-    pyodide_http.patch_all()
+    # xlwings Lite reloads this module on every edit; urllib only needs patching once
+    if not globals().get("PYODIDE_AVAILABLE"):
+        pyodide_http.patch_all()
     PYODIDE_AVAILABLE = True
 except ImportError:
     # Running in standard Python environment
     PYODIDE_AVAILABLE = False
 
+# Try to import pyfetch (browser fetch API) for non-blocking requests in Pyodide
+try:
+    from pyodide.http import pyfetch
+    PYFETCH_AVAILABLE = True
+except ImportError:
+    PYFETCH_AVAILABLE = False
+    pyfetch = None
+
+# Try to import the browser WebSocket for streaming quotes in Pyodide
+try:
+    from js import WebSocket as JsWebSocket
+    from pyodide.ffi import create_proxy
+    JS_WEBSOCKET_AVAILABLE = True
+except ImportError:
+    JS_WEBSOCKET_AVAILABLE = False
+    JsWebSocket = None
+    create_proxy = None
+
+# Try to import websocket-client for streaming quotes in standard Python
+try:
+    import websocket
+    WEBSOCKET_AVAILABLE = True
+except ImportError:
+    WEBSOCKET_AVAILABLE = False
+    websocket = None
+
 # Try to import SSL for HTTPS support
 try:
     import ssl
@@ -49,17 +96,56 @@ except ImportError:
 # Global Configuration Storage
 class OpenAlgoConfig:
     """Global configuration for OpenAlgo API"""
-    api_key = ""
+    api_key = ""  # Stored stripped by oa_api(); empty when not set
     version = "v1"
     host_url = "http://127.0.0.1:5000"
     force_http = False  # Force HTTP instead of HTTPS for compatibility
+    quote_ttl = 1.0  # Seconds a cached quote/depth response is served as fresh
+    _endpoints = {}  # Cached endpoint URLs keyed by route
+    
+    @classmethod
+    def url(cls, route):
+        """Return the full API URL for a route, cached until host or version changes"""
+        endpoint = cls._endpoints.get(route)
+        if endpoint is None:
+            endpoint = cls._endpoints[route] = f"{cls.host_url}/api/{cls.version}/{route}"
+        return endpoint
 
 # Global debug storage for request/response logging
 class DebugLog:
     """Store request/response logs for debugging"""
-    last_request = None
+    last_request = None  # Timestamps are epoch seconds, formatted on display
     last_response = None
     request_count = 0
+    verbose = False  # Print full request payloads and response bodies to the console
+
+# Short-lived cache for idempotent read-only endpoints
+class ResponseCache:
+    """Cache recent responses of read-only endpoints between Excel recalcs"""
+    # Seconds a cached response stays valid, keyed by endpoint route
+    ttl = {
+        'funds': 5.0,
+        'holdings': 5.0,
+        'history': 60.0,  # Past candles never change; only a range ending today grows
+        'intervals': 3600.0  # Supported intervals only change with the broker
+    }
+    # Minimum seconds between identical requests to endpoints Excel recalculates
+    # often; adapted to observed latency between the base value and max_throttle.
+    # Quotes and depth are not throttled here: OpenAlgoConfig.quote_ttl governs them
+    throttle = {
+        'orderbook': 1.0
+    }
+    max_throttle = 10.0
+    intervals = {}  # Current adapted interval per throttled route
+    # Routes that change account state and invalidate cached reads
+    write_routes = ('placeorder', 'modifyorder', 'cancelorder')
+    entries = OrderedDict()  # Least recently used first
+    max_entries = 256  # Expired, then least recently used entries are evicted beyond this
+    # Lookups answered from this cache or the quote cache (see oa_cache_stats).
+    # Each route is counted by one layer only: quotes and depth by the quote
+    # cache, everything else here, so throttle must never list quotes or depth
+    hits = 0
+    misses = 0
 
 # Response formatting configuration
 class ResponseConfig:
@@ -260,16 +346,247 @@ class ResponseConfig:
         'holdings': {'format': 'table'}
     }
 
+# Formatting hints per endpoint type, built once from ResponseConfig.endpoint_schemas
+# (an empty format means "use ResponseConfig.preferred_format")
+EndpointSchema = namedtuple('EndpointSchema', ['format', 'title', 'title_field', 'sort_by'], defaults=('', '', '', ''))
+_SCHEMAS = {name: EndpointSchema(**spec) for name, spec in ResponseConfig.endpoint_schemas.items()}
+_DEFAULT_SCHEMA = EndpointSchema()
+
+# Display position of each priority field, used as a sort key
+_PRIORITY_INDEX = {field: index for index, field in enumerate(ResponseConfig.priority_fields)}
+
+# Stale-while-revalidate cache for market data: (endpoint, symbol, exchange) -> (fetched_at, response)
+_QUOTE_CACHE = {}
+_QUOTE_REFRESHING = {}  # Cache key -> in-flight refresh task
+
+# Idle keep-alive connections per (scheme, host) for the non-Pyodide transport
+_CONNECTION_POOL = {}
+_MAX_IDLE_CONNECTIONS = 8  # Per host; extra connections are closed after use
+_CONNECT_RETRIES = 2  # Extra attempts when a new connection cannot be established
+_CONNECT_BACKOFF = 0.2  # Seconds before the first retry, doubled for each further one
+_CONNECT_TIMEOUT = 2.0  # Seconds allowed to establish a connection
+_READ_TIMEOUT = 30.0  # Seconds allowed for a response once the request is sent
+_READ_TIMEOUTS = {'quotes': 2.0, 'depth': 2.0, 'multiquotes': 5.0}  # Tighter limits for quote cells
+
+# Resolved host addresses, so new pooled connections skip the DNS lookup
+_DNS_CACHE = {}  # (host, port) -> (sockaddr, resolved_at)
+_DNS_TTL = 300.0
+
+# Async quote requests waiting to be sent together as one multiquotes request
+class QuoteBatch:
+    """Pending quote requests coalesced by post_request_async"""
+    window = 0.05  # Seconds to wait for more quote requests before sending
+    pending = []  # (payload, future) pairs
+    flush_handle = None
+    multiquotes_supported = True  # Cleared when the server has no multiquotes endpoint
+
+# Live quotes pushed over OpenAlgo's WebSocket feed (enabled with oa_stream)
+class QuoteStream:
+    """State of the optional WebSocket quote stream"""
+    url = ""
+    socket = None
+    handlers = ()  # Keeps callback proxies alive while the socket is open
+    authenticated = False
+    lock = threading.Lock()  # Guards authenticated and unsent against the websocket-client thread
+    subscribed = {}  # (symbol, exchange) pairs requested from the server, least recently read first
+    max_symbols = 200  # Least recently read symbols are unsubscribed beyond this
+    unsent = []  # Subscribe messages waiting for authentication
+    store = {}  # (symbol, exchange) -> (monotonic receive time, latest pushed quote data)
+    max_age = 1.0  # Seconds a pushed quote is served before falling back to HTTP
+    mode = 2  # OpenAlgo stream mode: 1 = LTP, 2 = Quote, 3 = Depth
+
+# Latest oa_test_connection result and the background check producing the next one
+_CONNECTION_TEST = {"result": None, "host_url": None, "checked_at": 0.0, "future": None}
+
+# Background worker pool for cache refreshes and concurrent requests (threads are unavailable under Pyodide)
+_POOL = None
+_POOL_WORKERS = 8
+
+# Browsers allow about 6 HTTP/1.1 connections per origin; extra fetches only queue
+_FETCH_SEMAPHORE = None
+_FETCH_LIMIT = 6
+
 # Utility Functions
+def get_worker_pool():
+    """Return the shared background worker pool, or None when threads are unavailable"""
+    global _POOL
+    if PYODIDE_AVAILABLE:
+        return None
+    if _POOL is None:
+        _POOL = ThreadPoolExecutor(max_workers=_POOL_WORKERS, thread_name_prefix="openalgo")
+    return _POOL
+
+def get_fetch_semaphore():
+    """Return the semaphore bounding concurrent browser fetches"""
+    global _FETCH_SEMAPHORE
+    if _FETCH_SEMAPHORE is None:
+        _FETCH_SEMAPHORE = asyncio.Semaphore(_FETCH_LIMIT)
+    return _FETCH_SEMAPHORE
+
+def get_pandas():
+    """Import pandas on first use, or return None if it is not installed"""
+    global pd
+    if pd is None and PANDAS_AVAILABLE:
+        import pandas as pd
+    return pd
+
+async def _refresh_market_data(key, endpoint, payload):
+    """Fetch market data and store successful responses in the quote cache"""
+    try:
+        response = await post_request_async(endpoint, payload)
+        if "error" not in response:
+            _QUOTE_CACHE[key] = (time.monotonic(), response)
+        return response
+    finally:
+        _QUOTE_REFRESHING.pop(key, None)
+
+async def cached_market_data_request(endpoint, payload):
+    """Make a market data request with stale-while-revalidate caching
+    
+    Responses younger than OpenAlgoConfig.quote_ttl are returned directly.
+    Responses up to 5x the TTL are returned immediately while a refresh runs
+    in the background; older or missing entries are awaited. Cells asking for
+    the same symbol at the same time share one request.
+    """
+    ttl = OpenAlgoConfig.quote_ttl
+    key = (endpoint, payload.get("symbol"), payload.get("exchange"))
+    entry = _QUOTE_CACHE.get(key)
+    age = time.monotonic() - entry[0] if entry and ttl > 0 else None
+    
+    if age is not None and age < ttl:
+        ResponseCache.hits += 1
+        return entry[1]
+    
+    task = _QUOTE_REFRESHING.get(key)
+    if task is None:
+        task = _QUOTE_REFRESHING[key] = asyncio.ensure_future(_refresh_market_data(key, endpoint, payload))
+    if age is not None and age < ttl * 5:
+        ResponseCache.hits += 1
+        return entry[1]
+    ResponseCache.misses += 1
+    return await asyncio.shield(task)
+
+def start_quote_stream(ws_url, api_key):
+    """Open the WebSocket quote stream and authenticate once it connects"""
+    stop_quote_stream()
+    QuoteStream.url = ws_url
+    
+    def on_open(*_):
+        QuoteStream.socket.send(encode_json_text({"action": "authenticate", "api_key": api_key}))
+    
+    def on_close(*_):
+        # A dropped connection is not reopened; forget it so oa_quotes uses HTTP
+        # instead of queueing subscriptions that would never be sent
+        if QuoteStream.socket is socket:
+            reset_quote_stream()
+    
+    if JS_WEBSOCKET_AVAILABLE:
+        on_message = lambda event: handle_stream_message(event.data)
+        handlers = (create_proxy(on_open), create_proxy(on_message), create_proxy(on_close))
+        socket = JsWebSocket.new(ws_url)
+        socket.onopen, socket.onmessage, socket.onclose = handlers
+        QuoteStream.socket, QuoteStream.handlers = socket, handlers
+    else:
+        on_message = lambda app, text: handle_stream_message(text)
+        socket = websocket.WebSocketApp(ws_url, on_open=on_open, on_message=on_message, on_close=on_close)
+        QuoteStream.socket = socket
+        threading.Thread(target=socket.run_forever, name="openalgo-stream", daemon=True).start()
+
+def reset_quote_stream():
+    """Forget the stream socket, subscriptions, queued messages and streamed quotes"""
+    QuoteStream.socket = None
+    with QuoteStream.lock:
+        QuoteStream.authenticated = False
+        del QuoteStream.unsent[:]
+    QuoteStream.subscribed.clear()
+    QuoteStream.store.clear()
+
+def stop_quote_stream():
+    """Close the WebSocket quote stream and forget streamed quotes"""
+    socket = QuoteStream.socket
+    reset_quote_stream()
+    if socket is not None:
+        try:
+            socket.close()
+        except Exception:
+            pass
+    for handler in QuoteStream.handlers:
+        handler.destroy()
+    QuoteStream.handlers = ()
+
+def handle_stream_message(text):
+    """Apply one message from the quote stream"""
+    try:
+        message = decode_json(text)
+    except (ValueError, TypeError):
+        return
+    if not isinstance(message, dict):
+        return
+    
+    if message.get("type") == "auth":
+        with QuoteStream.lock:
+            QuoteStream.authenticated = message.get("status") == "success"
+            if QuoteStream.authenticated:
+                for pending in QuoteStream.unsent:
+                    QuoteStream.socket.send(pending)
+                del QuoteStream.unsent[:]
+    elif message.get("type") == "market_data" and isinstance(message.get("data"), dict):
+        QuoteStream.store[(message.get("symbol"), message.get("exchange"))] = (time.monotonic(), message["data"])
+
+def send_stream_message(message):
+    """Send a message on the quote stream, or hold it until authentication succeeds"""
+    text = encode_json_text(message)
+    with QuoteStream.lock:
+        if QuoteStream.authenticated:
+            QuoteStream.socket.send(text)
+        else:
+            QuoteStream.unsent.append(text)
+
+def streamed_quote(symbol, exchange):
+    """Return the latest streamed quote as a quotes response, subscribing on first use
+    
+    Returns None when streaming is off or no quote has arrived within
+    QuoteStream.max_age seconds, so the caller falls back to an HTTP request.
+    """
+    if QuoteStream.socket is None:
+        return None
+    
+    key = (symbol, exchange)
+    subscribed = QuoteStream.subscribed
+    if key in subscribed:
+        del subscribed[key]  # Re-inserted below as the most recently read
+    else:
+        if len(subscribed) >= QuoteStream.max_symbols:
+            stale = next(iter(subscribed))
+            del subscribed[stale]
+            QuoteStream.store.pop(stale, None)
+            send_stream_message({"action": "unsubscribe", "symbol": stale[0], "exchange": stale[1], "mode": QuoteStream.mode})
+        send_stream_message({"action": "subscribe", "symbol": symbol, "exchange": exchange, "mode": QuoteStream.mode})
+    subscribed[key] = None
+    
+    entry = QuoteStream.store.get(key)
+    if entry is None or not QuoteStream.authenticated:
+        return None
+    received, data = entry
+    if time.monotonic() - received >= QuoteStream.max_age:
+        return None
+    return {"status": "success", "data": data}
+
 def normalize_url(endpoint):
     """Normalize URL and handle protocol issues"""
-    if OpenAlgoConfig.force_http and endpoint.startswith('https://'):
+    return _normalize_url(endpoint, OpenAlgoConfig.force_http)
+
+@lru_cache(maxsize=64)
+def _normalize_url(endpoint, force_http):
+    """Normalize URL for a given force_http setting (cached per endpoint)"""
+    if force_http and endpoint.startswith('https://'):
         endpoint = endpoint.replace('https://', 'http://')
         print(f"[URL_NORMALIZE] Forced HTTP: {endpoint}")
     return endpoint
 
+@lru_cache(maxsize=1)
 def create_ssl_context():
-    """Create SSL context for HTTPS requests"""
+    """Create SSL context for HTTPS requests (created once and shared)"""
     if not SSL_AVAILABLE:
         return None
     
@@ -283,136 +600,542 @@ def create_ssl_context():
         print(f"[SSL_WARNING] Could not create SSL context: {e}")
         return None
 
-def post_request_with_fallback(endpoint, payload, attempt=1):
-    """Make HTTP POST request with protocol fallback"""
-    if attempt > 2:  # Avoid infinite recursion
-        return {"error": "All connection attempts failed"}
+def encode_json(obj):
+    """Serialize an object to UTF-8 JSON bytes (orjson when available)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+def encode_json_text(obj):
+    """Serialize an object to a compact JSON string (orjson when available)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, separators=(',', ':'))
+
+def decode_json(data):
+    """Parse JSON from bytes (orjson when available)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def build_request_headers(data):
+    """Build HTTP headers for a JSON POST body"""
+    headers = {
+        'Content-Type': 'application/json',
+        'User-Agent': 'OpenAlgo-xlwings-Lite/1.0'
+    }
+    # Browsers reject scripted Content-Length/Connection/Accept-Encoding
+    # headers (and negotiate compression themselves), so only send them
+    # explicitly outside Pyodide
+    if not PYODIDE_AVAILABLE:
+        headers['Content-Length'] = str(len(data))
+        headers['Connection'] = 'keep-alive'
+        headers['Accept-Encoding'] = 'gzip'
+    return headers
+
+def resolve_address(host, port):
+    """Return a cached socket address for host:port, resolving it at most every _DNS_TTL seconds"""
+    cached = _DNS_CACHE.get((host, port))
+    if cached is not None and time.monotonic() - cached[1] < _DNS_TTL:
+        return cached[0]
+    sockaddr = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)[0][4]
+    _DNS_CACHE[(host, port)] = (sockaddr, time.monotonic())
+    return sockaddr
+
+def create_cached_connection(address, timeout=None, source_address=None, **kwargs):
+    """socket.create_connection() that connects to the cached address of the host
     
+    TLS still verifies the original host name, because HTTPSConnection wraps
+    the socket using its own host attribute. If the cached address stops
+    answering, it is dropped and the normal lookup is used instead.
+    """
     try:
-        print(f"[CONNECTION_ATTEMPT {attempt}] {endpoint}")
+        sockaddr = resolve_address(*address)
+    except OSError:
+        return socket.create_connection(address, timeout, source_address, **kwargs)
+    try:
+        return socket.create_connection(sockaddr[:2], timeout, source_address, **kwargs)
+    except OSError:
+        _DNS_CACHE.pop(address, None)
+        return socket.create_connection(address, timeout, source_address, **kwargs)
+
+def open_connection(scheme, netloc, timeout):
+    """Open a new HTTP(S) connection, retrying refused or timed-out connects
+    
+    Nothing has been sent when a connect fails, so retrying is safe for every
+    endpoint, including order placement.
+    """
+    for attempt in range(_CONNECT_RETRIES + 1):
+        if scheme == 'https':
+            conn = http.client.HTTPSConnection(netloc, timeout=timeout, context=create_ssl_context())
+        else:
+            conn = http.client.HTTPConnection(netloc, timeout=timeout)
+        conn._create_connection = create_cached_connection
+        try:
+            conn.connect()
+            return conn
+        except (ConnectionError, TimeoutError) as e:
+            conn.close()
+            if attempt == _CONNECT_RETRIES:
+                raise urllib.error.URLError(e)
+            time.sleep(_CONNECT_BACKOFF * 2 ** attempt)
+        except OSError as e:
+            conn.close()
+            raise urllib.error.URLError(e)
+
+def pooled_post(endpoint, data, headers, timeout=_READ_TIMEOUT):
+    """POST over a pooled keep-alive connection (standard Python only)
+    
+    Connections are reused across calls to the same host, avoiding a TCP/TLS
+    handshake per request. Connecting is bounded by _CONNECT_TIMEOUT and
+    waiting for the response by the given timeout. A reused connection that
+    the server has already closed is retried on a fresh connection if the
+    request could not be sent. Once it was sent, only read-only routes are
+    retried; order routes raise, as the server may already have acted on
+    them. Errors are raised as urllib.error exceptions so callers handle
+    both transports the same way.
+    
+    Returns:
+        Raw response body as bytes
+    """
+    parts = urllib.parse.urlsplit(endpoint)
+    path = parts.path or '/'
+    if parts.query:
+        path += '?' + parts.query
+    idle = _CONNECTION_POOL.setdefault((parts.scheme, parts.netloc), [])
+    resend_safe = path.rsplit('/', 1)[-1] not in ResponseCache.write_routes
+    
+    while True:
+        try:
+            conn = idle.pop()
+            reused = True
+        except IndexError:
+            conn = open_connection(parts.scheme, parts.netloc, _CONNECT_TIMEOUT)
+            reused = False
         
-        data = json.dumps(payload).encode('utf-8')
-        headers = {
-            'Content-Type': 'application/json',
-            'Accept': 'application/json',
-            'User-Agent': 'OpenAlgo-xlwings-Lite/1.0'
-        }
+        sent = False
+        try:
+            conn.sock.settimeout(timeout)
+            conn.request("POST", path, body=data, headers=headers)
+            sent = True
+            response = conn.getresponse()
+            body = response.read()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+            conn.close()
+            if reused and (not sent or resend_safe):
+                continue  # Stale keep-alive connection, retry on a fresh one
+            raise urllib.error.URLError(e)
+        except (OSError, http.client.HTTPException) as e:
+            conn.close()
+            raise urllib.error.URLError(e)
+        except Exception:
+            conn.close()
+            raise
+        
+        if response.will_close or len(idle) >= _MAX_IDLE_CONNECTIONS:
+            conn.close()
+        else:
+            idle.append(conn)
         
+        if response.status >= 400:
+            raise urllib.error.HTTPError(endpoint, response.status, response.reason, response.headers, None)
+        if response.getheader('Content-Encoding', '').lower() == 'gzip':
+            body = gzip.decompress(body)
+        return body
+
+def close_idle_connections():
+    """Close and forget all pooled keep-alive connections"""
+    for idle in _CONNECTION_POOL.values():
+        while idle:
+            idle.pop().close()
+    _CONNECTION_POOL.clear()
+
+def send_post(endpoint, payload):
+    """Send one JSON POST request and return the parsed response"""
+    data = encode_json(payload)
+    headers = build_request_headers(data)
+    timeout = _READ_TIMEOUTS.get(endpoint.rsplit('/', 1)[-1], _READ_TIMEOUT)
+    
+    if not PYODIDE_AVAILABLE:
+        # Reuse keep-alive connections outside the browser
+        body = pooled_post(endpoint, data, headers, timeout)
+    else:
         request = urllib.request.Request(endpoint, data=data, headers=headers)
         
         # Try with SSL context for HTTPS
-        if endpoint.startswith('https://'):
-            ssl_context = create_ssl_context()
-            if ssl_context:
-                response = urllib.request.urlopen(request, timeout=30, context=ssl_context)
-            else:
-                response = urllib.request.urlopen(request, timeout=30)
-        else:
-            response = urllib.request.urlopen(request, timeout=30)
-        
-        response_data = json.loads(response.read().decode('utf-8'))
-        print(f"[CONNECTION_SUCCESS] Attempt {attempt} succeeded")
-        return response_data
-        
-    except urllib.error.URLError as e:
-        error_str = str(e.reason)
-        if "unknown url type: https" in error_str.lower() and endpoint.startswith('https://'):
-            print(f"[HTTPS_FALLBACK] HTTPS not supported, trying HTTP")
-            http_endpoint = endpoint.replace('https://', 'http://')
-            return post_request_with_fallback(http_endpoint, payload, attempt + 1)
+        ssl_context = create_ssl_context() if endpoint.startswith('https://') else None
+        if ssl_context:
+            response = urllib.request.urlopen(request, timeout=timeout, context=ssl_context)
         else:
-            raise e  # Re-raise for other handling
+            response = urllib.request.urlopen(request, timeout=timeout)
+        body = response.read()
     
-    except Exception as e:
-        if attempt == 1 and endpoint.startswith('https://'):
+    return decode_json(body)
+
+def post_request_with_fallback(endpoint, payload):
+    """Make HTTP POST request, falling back from HTTPS to HTTP if HTTPS fails
+    
+    Order routes only fall back when HTTPS is unsupported, as any other
+    failure may come after the server has already acted on the order. A host
+    that refuses or times out over HTTPS is not tried again over HTTP either,
+    so an unreachable server fails after one round of connection attempts.
+    """
+    resend_safe = endpoint.rsplit('/', 1)[-1] not in ResponseCache.write_routes
+    candidates = [endpoint]
+    if endpoint.startswith('https://'):
+        candidates.append(endpoint.replace('https://', 'http://', 1))
+    
+    for attempt, candidate in enumerate(candidates, 1):
+        is_last = attempt == len(candidates)
+        try:
+            print(f"[CONNECTION_ATTEMPT {attempt}] {candidate}")
+            response_data = send_post(candidate, payload)
+            print(f"[CONNECTION_SUCCESS] Attempt {attempt} succeeded")
+            return response_data
+        
+        except urllib.error.URLError as e:
+            # Only an environment without HTTPS support is worth retrying over HTTP;
+            # refused connections and timeouts arrive here wrapped and are raised
+            if is_last or "unknown url type: https" not in str(e.reason).lower():
+                raise
+            print(f"[HTTPS_FALLBACK] HTTPS not supported, trying HTTP")
+        
+        except Exception as e:
+            if is_last or not resend_safe or isinstance(e, (ConnectionError, TimeoutError)):
+                raise
             print(f"[PROTOCOL_FALLBACK] HTTPS failed ({e}), trying HTTP")
-            http_endpoint = endpoint.replace('https://', 'http://')
-            return post_request_with_fallback(http_endpoint, payload, attempt + 1)
-        else:
-            raise e  # Re-raise for other handling
 
-def post_request(endpoint, payload):
-    """Make HTTP POST request using urllib (Pyodide compatible with HTTPS fallback)"""
-    # Log the request
+def response_cache_key(endpoint, payload):
+    """Build a hashable cache key from the endpoint and non-secret payload fields"""
+    return (endpoint, tuple(sorted((k, v) for k, v in payload.items() if k != "apikey")))
+
+def response_cache_ttl(route):
+    """Return how long a response for a route may be reused, or None if it is not cached"""
+    ttl = ResponseCache.ttl.get(route)
+    if ttl is None and route in ResponseCache.throttle:
+        ttl = ResponseCache.intervals.get(route, ResponseCache.throttle[route])
+    return ttl
+
+def adapt_throttle(route, latency):
+    """Back off a throttled route while the server is slow and recover once it is fast again"""
+    base = ResponseCache.throttle[route]
+    interval = ResponseCache.intervals.get(route, base)
+    if latency > interval:
+        interval = min(interval * 2, ResponseCache.max_throttle)
+    elif latency < interval / 4:
+        interval = max(interval / 2, base)
+    ResponseCache.intervals[route] = interval
+
+def lookup_response_cache(endpoint, payload):
+    """Return a cached read response or None; write endpoints invalidate cached reads"""
+    route = endpoint.rsplit('/', 1)[-1]
+    ttl = response_cache_ttl(route)
+    if ttl:
+        key = response_cache_key(endpoint, payload)
+        entry = ResponseCache.entries.get(key)
+        if entry and time.monotonic() - entry[0] < ttl:
+            ResponseCache.entries.move_to_end(key)
+            ResponseCache.hits += 1
+            return entry[1]
+        if entry:
+            del ResponseCache.entries[key]
+        ResponseCache.misses += 1
+    elif route in ResponseCache.write_routes:
+        ResponseCache.entries.clear()
+    return None
+
+def store_response_cache(endpoint, payload, response_data, latency=None):
+    """Cache a successful response if its endpoint is cacheable or throttled"""
+    route = endpoint.rsplit('/', 1)[-1]
+    if latency is not None and route in ResponseCache.throttle:
+        adapt_throttle(route, latency)
+    if route in ResponseCache.ttl or route in ResponseCache.throttle:
+        entries = ResponseCache.entries
+        key = response_cache_key(endpoint, payload)
+        now = time.monotonic()
+        entries.pop(key, None)
+        if len(entries) >= ResponseCache.max_entries:
+            purge_expired_responses(now)
+        if len(entries) >= ResponseCache.max_entries:
+            entries.popitem(last=False)
+        entries[key] = (now, response_data)
+
+def purge_expired_responses(now):
+    """Drop cached responses whose route TTL has passed"""
+    entries = ResponseCache.entries
+    for key, (stored, _) in list(entries.items()):
+        ttl = response_cache_ttl(key[0].rsplit('/', 1)[-1])
+        if not ttl or now - stored >= ttl:
+            del entries[key]
+
+def format_log_time(timestamp):
+    """Format a DebugLog epoch timestamp for display"""
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+
+def log_request(endpoint, payload):
+    """Record an outgoing request in DebugLog"""
     DebugLog.request_count += 1
     DebugLog.last_request = {
         "endpoint": endpoint,
         "payload": payload,
-        "timestamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        "timestamp": time.time(),
         "request_id": DebugLog.request_count
     }
     
     print(f"[REQUEST {DebugLog.request_count}] {endpoint}")
-    print(f"[PAYLOAD {DebugLog.request_count}] {json.dumps(payload, indent=2)}")
+    if DebugLog.verbose:
+        print(f"[PAYLOAD {DebugLog.request_count}] {json.dumps(payload, indent=2)}")
+
+def log_response(response_data, final_endpoint):
+    """Record a successful response in DebugLog"""
+    DebugLog.last_response = {
+        "status_code": 200,
+        "data": response_data,
+        "timestamp": time.time(),
+        "request_id": DebugLog.request_count,
+        "final_endpoint": final_endpoint
+    }
+    
+    print(f"[RESPONSE {DebugLog.request_count}] Status: 200")
+    if DebugLog.verbose:
+        print(f"[DATA {DebugLog.request_count}] {json.dumps(response_data, indent=2)}")
+
+def log_request_error(error):
+    """Record a failed request in DebugLog and return the error response"""
+    status_code = None
+    if isinstance(error, urllib.error.HTTPError):
+        error_msg = f"HTTP Error {error.code}: {error.reason}"
+        status_code = error.code
+    elif isinstance(error, urllib.error.URLError):
+        error_msg = f"URL Error: {error.reason}"
+        if "unknown url type: https" in str(error.reason).lower():
+            error_msg += " (HTTPS not supported - try HTTP or use oa_force_http())"
+    elif isinstance(error, json.JSONDecodeError):
+        error_msg = f"JSON Decode Error: {str(error)}"
+    else:
+        error_msg = str(error)
+    
+    DebugLog.last_response = {
+        "error": error_msg,
+        "timestamp": time.time(),
+        "request_id": DebugLog.request_count
+    }
+    if status_code is not None:
+        DebugLog.last_response["status_code"] = status_code
+    
+    print(f"[ERROR {DebugLog.request_count}] {error_msg}")
+    return {"error": error_msg}
+
+def post_request(endpoint, payload, use_cache=True):
+    """Make HTTP POST request using urllib (Pyodide compatible with HTTPS fallback)
+    
+    With use_cache=False the response cache is neither read nor updated, so
+    the request always reaches the server.
+    """
+    # Serve idempotent reads from cache; writes invalidate cached reads
+    cached = lookup_response_cache(endpoint, payload) if use_cache else None
+    if cached is not None:
+        return cached
+    
+    log_request(endpoint, payload)
     
     # Normalize URL based on configuration
     normalized_endpoint = normalize_url(endpoint)
     
     try:
         # Try request with automatic fallback
+        started = time.monotonic()
         response_data = post_request_with_fallback(normalized_endpoint, payload)
         
         # Check if we got an error response from fallback
         if isinstance(response_data, dict) and "error" in response_data:
             raise Exception(response_data["error"])
         
-        # Log successful response
-        DebugLog.last_response = {
-            "status_code": 200,
-            "data": response_data,
-            "timestamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            "request_id": DebugLog.request_count,
-            "final_endpoint": normalized_endpoint
-        }
-        
-        print(f"[RESPONSE {DebugLog.request_count}] Status: 200")
-        print(f"[DATA {DebugLog.request_count}] {json.dumps(response_data, indent=2)}")
-        
+        log_response(response_data, normalized_endpoint)
+        if use_cache:
+            store_response_cache(endpoint, payload, response_data, time.monotonic() - started)
         return response_data
         
-    except urllib.error.HTTPError as e:
-        error_msg = f"HTTP Error {e.code}: {e.reason}"
-        DebugLog.last_response = {
-            "error": error_msg,
-            "status_code": e.code,
-            "timestamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            "request_id": DebugLog.request_count
-        }
-        print(f"[ERROR {DebugLog.request_count}] {error_msg}")
-        return {"error": error_msg}
-        
-    except urllib.error.URLError as e:
-        error_msg = f"URL Error: {e.reason}"
-        if "unknown url type: https" in str(e.reason).lower():
-            error_msg += " (HTTPS not supported - try HTTP or use oa_force_http())"
-        DebugLog.last_response = {
-            "error": error_msg,
-            "timestamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            "request_id": DebugLog.request_count
-        }
-        print(f"[ERROR {DebugLog.request_count}] {error_msg}")
-        return {"error": error_msg}
-        
-    except json.JSONDecodeError as e:
-        error_msg = f"JSON Decode Error: {str(e)}"
-        DebugLog.last_response = {
-            "error": error_msg,
-            "timestamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            "request_id": DebugLog.request_count
-        }
-        print(f"[ERROR {DebugLog.request_count}] {error_msg}")
-        return {"error": error_msg}
+    except Exception as e:
+        return log_request_error(e)
+
+async def post_request_async(endpoint, payload):
+    """Make HTTP POST request without blocking the event loop
+    
+    Quote requests are coalesced with other quote requests made within
+    QuoteBatch.window seconds into a single multiquotes request.
+    """
+    if endpoint == OpenAlgoConfig.url("quotes"):
+        return await queue_quote_request(payload)
+    return await send_request_async(endpoint, payload)
+
+async def send_request_async(endpoint, payload):
+    """Send one HTTP POST request without blocking the event loop
+    
+    Under Pyodide the request goes through the browser fetch API, so several
+    awaiting callers overlap on the network instead of queuing behind
+    synchronous XHR calls. Elsewhere post_request runs on the worker pool.
+    """
+    if not PYFETCH_AVAILABLE:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_worker_pool(), post_request, endpoint, payload)
+    
+    cached = lookup_response_cache(endpoint, payload)
+    if cached is not None:
+        return cached
+    
+    log_request(endpoint, payload)
+    normalized_endpoint = normalize_url(endpoint)
+    
+    try:
+        async with get_fetch_semaphore():
+            started = time.monotonic()
+            response = await pyfetch(
+                normalized_endpoint,
+                method="POST",
+                headers={'Content-Type': 'application/json'},
+                body=encode_json_text(payload),
+                credentials="omit"  # The API key travels in the body; cookies are never needed
+            )
+            if not response.ok:
+                raise urllib.error.HTTPError(normalized_endpoint, response.status, response.status_text, None, None)
+            body = await response.bytes()
+        
+        response_data = decode_json(body)
+        log_response(response_data, normalized_endpoint)
+        store_response_cache(endpoint, payload, response_data, time.monotonic() - started)
+        return response_data
         
     except Exception as e:
-        error_msg = str(e)
-        DebugLog.last_response = {
-            "error": error_msg,
-            "timestamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            "request_id": DebugLog.request_count
-        }
-        print(f"[ERROR {DebugLog.request_count}] {error_msg}")
-        return {"error": error_msg}
+        return log_request_error(e)
+
+async def queue_quote_request(payload):
+    """Add a quote request to the pending batch and wait for its response"""
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    QuoteBatch.pending.append((payload, future))
+    if QuoteBatch.flush_handle is None:
+        QuoteBatch.flush_handle = loop.call_later(
+            QuoteBatch.window, lambda: asyncio.ensure_future(flush_quote_batch())
+        )
+    return await future
+
+def parse_multiquotes_response(response):
+    """Split a multiquotes response into per-symbol quote responses
+    
+    Returns:
+        Dict mapping (symbol, exchange) to a response shaped like the quotes endpoint's
+    """
+    if response.get("error", "").startswith("HTTP Error 404"):
+        QuoteBatch.multiquotes_supported = False
+    
+    quotes = {}
+    for item in response.get("results") or []:
+        if isinstance(item, dict) and item.get("data") is not None:
+            quotes[(item.get("symbol"), item.get("exchange"))] = {"status": "success", "data": item["data"]}
+    return quotes
+
+async def fetch_quotes(api_key, keys):
+    """Get quotes for many (symbol, exchange) pairs with as few requests as possible
+    
+    Fresh entries come from the quote cache. The rest are queued together with
+    post_requests_batch_async, so QuoteBatch sends them as one multiquotes
+    request and falls back to concurrent single-symbol requests for anything
+    it did not return. Fetched quotes are cached for oa_quotes.
+    
+    Returns:
+        Dict mapping (symbol, exchange) to a quotes response
+    """
+    quotes_endpoint = OpenAlgoConfig.url("quotes")
+    ttl = OpenAlgoConfig.quote_ttl
+    now = time.monotonic()
+    
+    results = {}
+    missing = []
+    for key in dict.fromkeys(keys):
+        entry = _QUOTE_CACHE.get((quotes_endpoint,) + key)
+        if entry and ttl > 0 and now - entry[0] < ttl:
+            results[key] = entry[1]
+        else:
+            missing.append(key)
+    ResponseCache.hits += len(results)
+    ResponseCache.misses += len(missing)
+    
+    responses = await post_requests_batch_async(
+        (quotes_endpoint, {"apikey": api_key, "symbol": symbol, "exchange": exchange})
+        for symbol, exchange in missing
+    )
+    results.update(zip(missing, responses))
+    
+    now = time.monotonic()
+    for key in missing:
+        if "error" not in results[key]:
+            _QUOTE_CACHE[(quotes_endpoint,) + key] = (now, results[key])
+    return results
 
+async def flush_quote_batch():
+    """Send pending quote requests as one multiquotes request and resolve each caller
+    
+    Symbols missing from the multiquotes response (or every symbol, if the
+    server does not support multiquotes) fall back to individual requests.
+    """
+    batch, QuoteBatch.pending = QuoteBatch.pending, []
+    QuoteBatch.flush_handle = None
+    quotes_endpoint = OpenAlgoConfig.url("quotes")
+    
+    # One payload per distinct (symbol, exchange)
+    unique = {}
+    for payload, _ in batch:
+        unique.setdefault((payload.get("symbol"), payload.get("exchange")), payload)
+    
+    results = {}
+    if len(unique) > 1 and QuoteBatch.multiquotes_supported:
+        response = await send_request_async(OpenAlgoConfig.url("multiquotes"), {
+            "apikey": batch[0][0].get("apikey"),
+            "symbols": [{"symbol": symbol, "exchange": exchange} for symbol, exchange in unique]
+        })
+        results.update(parse_multiquotes_response(response))
+    
+    missing = [key for key in unique if key not in results]
+    fallback = await asyncio.gather(*(send_request_async(quotes_endpoint, unique[key]) for key in missing))
+    results.update(zip(missing, fallback))
+    
+    for payload, future in batch:
+        if not future.done():
+            future.set_result(results[(payload.get("symbol"), payload.get("exchange"))])
+
+async def post_requests_batch_async(requests):
+    """Make several HTTP POST requests concurrently from async code
+    
+    Args:
+        requests: Iterable of (endpoint, payload) tuples
+    
+    Returns:
+        List of response dictionaries in the same order as the requests
+    """
+    return list(await asyncio.gather(*(post_request_async(endpoint, payload) for endpoint, payload in requests)))
+
+def post_requests_batch(requests):
+    """Make several HTTP POST requests concurrently
+    
+    Requests run in parallel on the worker pool so the total wait is close to
+    the slowest single request. Under Pyodide they run one after another.
+    
+    Args:
+        requests: Iterable of (endpoint, payload) tuples
+    
+    Returns:
+        List of response dictionaries in the same order as the requests
+    """
+    requests = list(requests)
+    pool = get_worker_pool()
+    if pool is None or len(requests) < 2:
+        return [post_request(endpoint, payload) for endpoint, payload in requests]
+    
+    futures = [pool.submit(post_request, endpoint, payload) for endpoint, payload in requests]
+    return [future.result() for future in futures]
+
+@lru_cache(maxsize=64)
 def detect_endpoint_type(endpoint):
     """Extract endpoint type from URL for schema detection"""
     if not endpoint:
@@ -425,131 +1148,182 @@ def detect_endpoint_type(endpoint):
         return endpoint_type
     return 'unknown'
 
-def smart_format_value(key, value):
-    """Apply intelligent formatting to field values"""
-    if value is None or value == "":
-        return ""
-    
-    # Handle timestamps
-    timestamp_fields = [
-        'timestamp', 'date', 'time', 'order_time', 'update_time', 
-        'trade_time', 'last_update_time', 'market_open_time', 
-        'market_close_time', 'expiry_date'
-    ]
-    if key.lower() in timestamp_fields and isinstance(value, (int, float)):
+# Field categories used by smart_format_value
+TIMESTAMP_FIELDS = frozenset([
+    'timestamp', 'date', 'time', 'order_time', 'update_time', 
+    'trade_time', 'last_update_time', 'market_open_time', 
+    'market_close_time', 'expiry_date'
+])
+DATE_STRING_FIELDS = frozenset(['expiry', 'expiry_date'])
+PRICE_FIELDS = frozenset([
+    'price', 'ltp', 'high', 'low', 'open', 'close', 'trigger_price',
+    'triggerprice', 'averageprice', 'last_price', 'prev_close',
+    'bid_price', 'ask_price', 'buy_price', 'sell_price',
+    'strikeprice', 'strike_price', 'underlying_price',
+    'day_high', 'day_low', 'year_high', 'year_low',
+    'prev_open', 'prev_high', 'prev_low', 'upper_circuit', 'lower_circuit',
+    'price_change', 'day_change'
+])
+CURRENCY_FIELDS = frozenset([
+    'availablecash', 'utiliseddebits', 'utilisedpayout', 
+    'collateral', 'payin', 'payout', 'turnover',
+    'buy_value', 'sell_value', 'total_traded_value',
+    'margin_required', 'margin_blocked', 'margin_available',
+    'span_margin', 'elm_margin', 'var_margin', 'exposure'
+])
+QUANTITY_FIELDS = frozenset([
+    'quantity', 'remainingquantity', 'filledquantity', 'unfilledshares',
+    'totalbuyquantity', 'totalsellquantity', 'pendingquantity',
+    'rejectedquantity', 'cancelledquantity', 'disclosed_quantity',
+    'bid_qty', 'ask_qty', 'last_qty', 'volume', 'total_traded_volume',
+    'net_quantity', 'buy_quantity', 'sell_quantity', 'lot_size'
+])
+PERCENTAGE_FIELDS = frozenset([
+    'pnl_percent', 'percent_change', 'day_change_percent',
+    'change_percent', 'implied_volatility'
+])
+GREEK_FIELDS = frozenset(['delta', 'gamma', 'theta', 'vega', 'rho'])
+SPECIAL_INT_FIELDS = frozenset(['days_to_expiry', 'bid_orders', 'ask_orders', 'multiplier'])
+
+def format_timestamp_value(value):
+    """Format an epoch timestamp, or None if value is not one"""
+    if isinstance(value, (int, float)):
         try:
             dt = datetime.fromtimestamp(value)
             return dt.strftime(ResponseConfig.timestamp_format)
         except (ValueError, TypeError, OSError):
             pass
-    
-    # Handle date strings (YYYY-MM-DD format)
-    if key.lower() in ['expiry', 'expiry_date'] and isinstance(value, str):
-        try:
-            # Try to parse different date formats
-            if len(value) == 10 and value.count('-') == 2:  # YYYY-MM-DD
-                return value
-            elif len(value) == 8 and value.isdigit():  # YYYYMMDD
-                return f"{value[:4]}-{value[4:6]}-{value[6:8]}"
-        except (ValueError, TypeError):
-            pass
-    
-    # Handle price formatting (2 decimal places)
-    price_fields = [
-        'price', 'ltp', 'high', 'low', 'open', 'close', 'trigger_price',
-        'triggerprice', 'averageprice', 'last_price', 'prev_close',
-        'bid_price', 'ask_price', 'buy_price', 'sell_price',
-        'strikeprice', 'strike_price', 'underlying_price',
-        'day_high', 'day_low', 'year_high', 'year_low',
-        'prev_open', 'prev_high', 'prev_low', 'upper_circuit', 'lower_circuit',
-        'price_change', 'day_change'
-    ]
-    if key.lower() in price_fields:
-        try:
-            num_val = float(value)
+    return None
+
+def format_date_string_value(value):
+    """Format a YYYY-MM-DD or YYYYMMDD date string, or None if value is not one"""
+    if isinstance(value, str):
+        if len(value) == 10 and value.count('-') == 2:  # YYYY-MM-DD
+            return value
+        elif len(value) == 8 and value.isdigit():  # YYYYMMDD
+            return f"{value[:4]}-{value[4:6]}-{value[6:8]}"
+    return None
+
+def format_expiry_date_value(value):
+    """Format an expiry date given as an epoch timestamp or a date string"""
+    formatted = format_timestamp_value(value)
+    return formatted if formatted is not None else format_date_string_value(value)
+
+def format_price_value(value):
+    """Format a price with 2 decimal places"""
+    try:
+        num_val = float(value)
+        return f"{num_val:.2f}" if num_val != 0 else "0.00"
+    except (ValueError, TypeError):
+        return None
+
+def format_currency_value(value):
+    """Format a currency amount with 2 decimal places and thousands separators"""
+    try:
+        num_val = float(value)
+        if num_val >= 10000:  # Add thousands separator for large amounts
+            return f"{num_val:,.2f}"
+        else:
             return f"{num_val:.2f}" if num_val != 0 else "0.00"
-        except (ValueError, TypeError):
-            pass
-    
-    # Handle currency/value formatting (2 decimal places)
-    currency_fields = [
-        'availablecash', 'utiliseddebits', 'utilisedpayout', 
-        'collateral', 'payin', 'payout', 'turnover',
-        'buy_value', 'sell_value', 'total_traded_value',
-        'margin_required', 'margin_blocked', 'margin_available',
-        'span_margin', 'elm_margin', 'var_margin', 'exposure'
-    ]
-    if key.lower() in currency_fields:
-        try:
-            num_val = float(value)
-            if num_val >= 10000:  # Add thousands separator for large amounts
-                return f"{num_val:,.2f}"
-            else:
-                return f"{num_val:.2f}" if num_val != 0 else "0.00"
-        except (ValueError, TypeError):
-            pass
-    
-    # Handle quantity formatting (no decimals)
-    quantity_fields = [
-        'quantity', 'remainingquantity', 'filledquantity', 'unfilledshares',
-        'totalbuyquantity', 'totalsellquantity', 'pendingquantity',
-        'rejectedquantity', 'cancelledquantity', 'disclosed_quantity',
-        'bid_qty', 'ask_qty', 'last_qty', 'volume', 'total_traded_volume',
-        'net_quantity', 'buy_quantity', 'sell_quantity', 'lot_size'
-    ]
-    if key.lower() in quantity_fields:
-        try:
-            num_val = int(float(value))
-            if num_val >= 1000:  # Add thousands separator for large quantities
-                return f"{num_val:,}"
-            else:
-                return str(num_val)
-        except (ValueError, TypeError):
-            pass
-    
-    # Handle percentage fields
-    percentage_fields = [
-        'pnl_percent', 'percent_change', 'day_change_percent',
-        'change_percent', 'implied_volatility'
-    ]
-    if ('percent' in key.lower() or key.lower().endswith('_pct') or 
-        key.lower() in percentage_fields):
-        try:
-            num_val = float(value)
-            return f"{num_val:.2f}%"
-        except (ValueError, TypeError):
-            pass
-    
-    # Handle Greek values (options)
-    greek_fields = ['delta', 'gamma', 'theta', 'vega', 'rho']
-    if key.lower() in greek_fields:
-        try:
-            num_val = float(value)
-            return f"{num_val:.4f}"  # Higher precision for Greeks
-        except (ValueError, TypeError):
-            pass
-    
-    # Handle special integer fields
-    special_int_fields = ['days_to_expiry', 'bid_orders', 'ask_orders', 'multiplier']
-    if key.lower() in special_int_fields:
-        try:
-            num_val = int(float(value))
+    except (ValueError, TypeError):
+        return None
+
+def format_quantity_value(value):
+    """Format a quantity with no decimals and thousands separators"""
+    try:
+        num_val = int(float(value))
+        if num_val >= 1000:  # Add thousands separator for large quantities
+            return f"{num_val:,}"
+        else:
             return str(num_val)
-        except (ValueError, TypeError):
-            pass
+    except (ValueError, TypeError):
+        return None
+
+def format_percentage_value(value):
+    """Format a percentage with 2 decimal places"""
+    try:
+        num_val = float(value)
+        return f"{num_val:.2f}%"
+    except (ValueError, TypeError):
+        return None
+
+def format_greek_value(value):
+    """Format an option Greek with 4 decimal places"""
+    try:
+        num_val = float(value)
+        return f"{num_val:.4f}"  # Higher precision for Greeks
+    except (ValueError, TypeError):
+        return None
+
+def format_int_value(value):
+    """Format a whole number"""
+    try:
+        num_val = int(float(value))
+        return str(num_val)
+    except (ValueError, TypeError):
+        return None
+
+# Formatter for each known field name; formatters return None when a value doesn't fit
+FIELD_FORMATTERS = {}
+for fields, formatter in (
+    (TIMESTAMP_FIELDS, format_timestamp_value),
+    (DATE_STRING_FIELDS, format_date_string_value),
+    (PRICE_FIELDS, format_price_value),
+    (CURRENCY_FIELDS, format_currency_value),
+    (QUANTITY_FIELDS, format_quantity_value),
+    (PERCENTAGE_FIELDS, format_percentage_value),
+    (GREEK_FIELDS, format_greek_value),
+    (SPECIAL_INT_FIELDS, format_int_value)
+):
+    for field in fields:
+        FIELD_FORMATTERS.setdefault(field, formatter)
+FIELD_FORMATTERS.update(dict.fromkeys(TIMESTAMP_FIELDS & DATE_STRING_FIELDS, format_expiry_date_value))
+del fields, formatter, field
+
+# printf-style patterns giving the same output as the scalar formatters, used to
+# format a whole numeric column in one pass
+COLUMN_FORMATS = {
+    format_price_value: '%.2f',
+    format_percentage_value: '%.2f%%',
+    format_greek_value: '%.4f'
+}
+COLUMN_FORMAT_MIN_ROWS = 512  # Smaller tables are formatted cell by cell
+
+@lru_cache(maxsize=1024)
+def resolve_formatter(key):
+    """Return the formatter for a field name, or None to display values as-is"""
+    field = key.lower()
+    formatter = FIELD_FORMATTERS.get(field)
+    if formatter is None and ('percent' in field or field.endswith('_pct')):
+        formatter = format_percentage_value
+    return formatter
+
+def format_cell(formatter, value):
+    """Format a value with an already resolved field formatter"""
+    if value is None or value == "":
+        return ""
+    
+    if formatter is not None:
+        formatted = formatter(value)
+        if formatted is not None:
+            return formatted
     
     return str(value)
 
+def smart_format_value(key, value):
+    """Apply intelligent formatting to field values"""
+    return format_cell(resolve_formatter(key), value)
+
+@lru_cache(maxsize=1024)
 def get_display_label(field_name):
     """Get user-friendly display label for field"""
     return ResponseConfig.field_labels.get(field_name, field_name.replace('_', ' ').title())
 
+@lru_cache(maxsize=512)
 def sort_fields_by_priority(fields):
-    """Sort fields by priority order for better display"""
-    priority_set = set(ResponseConfig.priority_fields)
-    priority_fields = [f for f in ResponseConfig.priority_fields if f in fields]
-    other_fields = sorted([f for f in fields if f not in priority_set])
-    return priority_fields + other_fields
+    """Sort a tuple of fields by priority order for better display"""
+    unranked = len(_PRIORITY_INDEX)
+    return tuple(sorted(fields, key=lambda f: (_PRIORITY_INDEX.get(f, unranked), f)))
 
 def process_api_response(response, endpoint="", custom_title=""):
     """
@@ -573,10 +1347,10 @@ def process_api_response(response, endpoint="", custom_title=""):
     
     # Detect endpoint type for formatting hints
     endpoint_type = detect_endpoint_type(endpoint)
-    schema = ResponseConfig.endpoint_schemas.get(endpoint_type, {})
+    schema = _SCHEMAS.get(endpoint_type, _DEFAULT_SCHEMA)
     
     # Determine format type
-    format_type = schema.get('format', ResponseConfig.preferred_format)
+    format_type = schema.format or ResponseConfig.preferred_format
     if format_type == 'auto':
         format_type = 'table' if isinstance(data, list) else 'key_value'
     
@@ -588,14 +1362,14 @@ def process_api_response(response, endpoint="", custom_title=""):
     
     # Process based on determined format
     if format_type == 'key_value':
-        return format_key_value_data(data, endpoint_type, custom_title)
+        return format_key_value_data(data, endpoint_type, custom_title, schema)
     elif format_type == 'table':
         return format_table_data(data, endpoint_type, schema)
     else:
         # Fallback to enhanced format_for_excel
         return format_for_excel(data)
 
-def format_key_value_data(data, endpoint_type="", custom_title=""):
+def format_key_value_data(data, endpoint_type="", custom_title="", schema=None):
     """Format data as key-value pairs with intelligent ordering"""
     if not isinstance(data, dict):
         if isinstance(data, list) and data and isinstance(data[0], dict):
@@ -606,28 +1380,45 @@ def format_key_value_data(data, endpoint_type="", custom_title=""):
     # Create title
     title = custom_title
     if not title:
-        schema = ResponseConfig.endpoint_schemas.get(endpoint_type, {})
-        if 'title' in schema:
-            title = schema['title']
-        elif 'title_field' in schema and schema['title_field'] in data:
-            symbol = data.get(schema['title_field'], '')
+        if schema is None:
+            schema = _SCHEMAS.get(endpoint_type, _DEFAULT_SCHEMA)
+        if schema.title:
+            title = schema.title
+        elif schema.title_field and schema.title_field in data:
+            symbol = data.get(schema.title_field, '')
             exchange = data.get('exchange', '')
             title = f"{symbol} ({exchange})" if exchange else str(symbol)
         else:
             title = endpoint_type.title() + " Data"
     
     # Sort fields by priority
-    fields = sort_fields_by_priority(list(data.keys()))
+    fields = sort_fields_by_priority(tuple(data))
     
     # Build result
-    result = [[title, "Value"]] if title else [["Field", "Value"]]
+    label, fmt = get_display_label, smart_format_value
+    return [(title or "Field", "Value"), *[(label(field), fmt(field, data[field])) for field in fields]]
+
+def format_numeric_column(field, data):
+    """Format one table column in a single pass, or return None to use the per-cell path
     
-    for field in fields:
-        label = get_display_label(field)
-        value = smart_format_value(field, data[field])
-        result.append([label, value])
+    Only columns whose formatter has a COLUMN_FORMATS pattern and whose values
+    are all plain ints/floats are handled, so the output matches smart_format_value.
+    """
+    pattern = COLUMN_FORMATS.get(resolve_formatter(field))
+    if pattern is None:
+        return None
     
-    return result
+    values = [item.get(field, "") for item in data]
+    if not all(value.__class__ is float or value.__class__ is int for value in values):
+        return None
+    
+    try:
+        if pattern == '%.2f':
+            # Adding 0.0 turns -0.0 into 0.0, which the scalar path shows as "0.00"
+            return [pattern % (value + 0.0) for value in values]
+        return list(map(pattern.__mod__, values))
+    except OverflowError:
+        return None
 
 def format_table_data(data, endpoint_type="", schema=None):
     """Format data as a table with intelligent column ordering"""
@@ -639,37 +1430,41 @@ def format_table_data(data, endpoint_type="", schema=None):
     
     if not isinstance(data[0], dict):
         # Simple list - convert to single column
-        return [["Items"]] + [[str(item)] for item in data]
+        return [("Items",)] + [(str(item),) for item in data]
     
-    # Get all unique fields from all records
-    all_fields = set()
-    for item in data:
-        if isinstance(item, dict):
-            all_fields.update(item.keys())
+    # Get all unique fields from all records, in first-seen order
+    all_fields = dict.fromkeys(field for item in data if isinstance(item, dict) for field in item)
     
     # Sort fields by priority
-    ordered_fields = sort_fields_by_priority(list(all_fields))
+    ordered_fields = sort_fields_by_priority(tuple(all_fields))
+    
+    # Sort raw records (e.g. by timestamp) before formatting so numbers compare numerically
+    sort_field = schema.sort_by if schema else ''
+    if sort_field and sort_field in all_fields:
+        try:
+            data = sorted(data, key=lambda item: item.get(sort_field, ""), reverse=True)
+        except TypeError:
+            data = sorted(data, key=lambda item: str(item.get(sort_field, "")), reverse=True)
     
     # Create headers with display labels
-    headers = [get_display_label(field) for field in ordered_fields]
-    result = [headers]
+    result = [tuple(get_display_label(field) for field in ordered_fields)]
+    
+    # Process each row (tuples are cheaper to build and marshal than lists)
+    # Field formatters are resolved once per column rather than once per cell
+    fmt = format_cell
+    formatters = [(field, resolve_formatter(field)) for field in ordered_fields]
+    if len(data) < COLUMN_FORMAT_MIN_ROWS:
+        result.extend(tuple([fmt(formatter, item.get(field, "")) for field, formatter in formatters]) for item in data)
+        return result
     
-    # Process each row
-    for item in data:
-        row = []
-        for field in ordered_fields:
-            value = item.get(field, "")
-            formatted_value = smart_format_value(field, value)
-            row.append(formatted_value)
-        result.append(row)
-    
-    # Sort by timestamp if specified in schema
-    if schema and 'sort_by' in schema:
-        sort_field = schema['sort_by']
-        if sort_field in ordered_fields:
-            field_index = ordered_fields.index(sort_field)
-            # Sort data rows (skip header)
-            result[1:] = sorted(result[1:], key=lambda x: x[field_index], reverse=True)
+    # Large tables: format numeric columns in one pass each, the rest cell by cell
+    columns = []
+    for field, formatter in formatters:
+        column = format_numeric_column(field, data)
+        if column is None:
+            column = [fmt(formatter, item.get(field, "")) for item in data]
+        columns.append(column)
+    result.extend(zip(*columns))
     
     return result
 
@@ -694,8 +1489,8 @@ def format_for_excel(data, headers=None):
             # List of simple values
             return [[str(item)] for item in data]
     
-    elif PANDAS_AVAILABLE and pd and isinstance(data, pd.DataFrame):
-        # Pandas DataFrame (only if pandas is available)
+    elif type(data).__name__ == 'DataFrame' and get_pandas() and isinstance(data, pd.DataFrame):
+        # Pandas DataFrame (pandas is only imported once one is seen)
         result = [data.columns.tolist()]
         result.extend(data.values.tolist())
         return result
@@ -705,13 +1500,23 @@ def format_for_excel(data, headers=None):
         return [[str(data)]]
 
 def validate_api_key():
-    """Check if API key is configured"""
-    return bool(OpenAlgoConfig.api_key and OpenAlgoConfig.api_key.strip())
+    """Return the configured API key, or an empty string if it is not set
+    
+    oa_api() stores the key already stripped, so no per-call cleanup is needed.
+    """
+    return OpenAlgoConfig.api_key
+
+def _to_str(value):
+    """Convert a value to str, skipping the conversion for values that already are"""
+    return value if value.__class__ is str else str(value)
 
 def format_error(message):
     """Return error in Excel-compatible format"""
     return [[f"Error: {message}"]]
 
+# Returned by every UDF called before oa_api(); immutable, so one instance is shared
+API_KEY_MISSING_ERROR = (("Error: OpenAlgo API Key is not set. Use oa_api()",),)
+
 # xlwings Lite Implementation - Direct HTTP Requests
 @func
 def test_xlwings():
@@ -750,7 +1555,7 @@ def oa_debug_last_request():
     result = [
         ["Property", "Value"],
         ["Request ID", str(req["request_id"])],
-        ["Timestamp", req["timestamp"]],
+        ["Timestamp", format_log_time(req["timestamp"])],
         ["Endpoint", req["endpoint"]],
         ["API Key", "***" + req["payload"]["apikey"][-4:] if "apikey" in req["payload"] else "Not Found"]
     ]
@@ -772,7 +1577,7 @@ def oa_debug_last_response():
     result = [
         ["Property", "Value"],
         ["Request ID", str(resp["request_id"])],
-        ["Timestamp", resp["timestamp"]]
+        ["Timestamp", format_log_time(resp["timestamp"])]
     ]
     
     if "status_code" in resp:
@@ -792,6 +1597,22 @@ def oa_debug_last_response():
     
     return result
 
+@func
+def oa_set_verbose(enable=True):
+    """Enable or disable printing full payloads and responses to the console
+    
+    Args:
+        enable: True to print request payloads and response bodies, False to skip them (default: True)
+    
+    Returns:
+        Configuration confirmation message
+    """
+    DebugLog.verbose = bool(enable)
+    if enable:
+        return "Verbose logging enabled - request payloads and response bodies will be printed"
+    else:
+        return "Verbose logging disabled - only request and response summaries will be printed"
+
 @func
 def oa_debug_full_log():
     """Get a combined view of the last request and response"""
@@ -806,7 +1627,7 @@ def oa_debug_full_log():
             ["", ""],
             ["REQUEST INFO", ""],
             ["Request ID", str(req["request_id"])],
-            ["Timestamp", req["timestamp"]],
+            ["Timestamp", format_log_time(req["timestamp"])],
             ["Endpoint", req["endpoint"]],
             ["Method", "POST"],
             ["Content-Type", "application/json"]
@@ -825,7 +1646,7 @@ def oa_debug_full_log():
             ["", ""],
             ["RESPONSE INFO", ""],
             ["Response ID", str(resp["request_id"])],
-            ["Timestamp", resp["timestamp"]]
+            ["Timestamp", format_log_time(resp["timestamp"])]
         ])
         
         if "status_code" in resp:
@@ -848,7 +1669,8 @@ def oa_debug_full_log():
 @arg("api_key", doc='Your OpenAlgo API key for authentication (get from OpenAlgo dashboard)')
 @arg("version", doc='API version to use (default: "v1")')
 @arg("host_url", doc='OpenAlgo server URL (default: "http://127.0.0.1:5000" for local)')
-def oa_api(api_key, version="v1", host_url="http://127.0.0.1:5000"):
+@arg("quote_ttl", doc='Seconds to reuse cached quotes/depth between recalcs (default: 1, 0 disables)')
+def oa_api(api_key, version="v1", host_url="http://127.0.0.1:5000", quote_ttl=1.0):
     """Configure OpenAlgo API credentials and connection settings
     
     Sets up the global configuration for all OpenAlgo trading functions.
@@ -858,6 +1680,10 @@ def oa_api(api_key, version="v1", host_url="http://127.0.0.1:5000"):
         api_key: Your unique OpenAlgo API authentication key
         version: API version (currently supports "v1")  
         host_url: OpenAlgo server endpoint URL
+        quote_ttl: Cache lifetime in seconds for oa_quotes/oa_depth responses
+            (default 1). Responses up to 5x older are shown while a refresh runs
+            in the background. 0 disables quote caching, so every call reaches
+            the server
         
     Returns:
         Configuration confirmation message
@@ -871,9 +1697,24 @@ def oa_api(api_key, version="v1", host_url="http://127.0.0.1:5000"):
     if not api_key or not api_key.strip():
         return "Error: API Key is required."
     
+    try:
+        quote_ttl = max(float(quote_ttl), 0.0) if quote_ttl not in (None, "") else 1.0
+    except (ValueError, TypeError):
+        return "Error: quote_ttl must be a number of seconds."
+    
     OpenAlgoConfig.api_key = str(api_key).strip()
     OpenAlgoConfig.version = str(version)
     OpenAlgoConfig.host_url = str(host_url).rstrip('/')
+    OpenAlgoConfig.quote_ttl = quote_ttl
+    OpenAlgoConfig._endpoints.clear()
+    _QUOTE_CACHE.clear()
+    ResponseCache.entries.clear()
+    ResponseCache.intervals.clear()
+    stop_quote_stream()  # The stream is authenticated with the old key
+    _CONNECTION_TEST["result"] = None
+    QuoteBatch.multiquotes_supported = True
+    close_idle_connections()
+    _DNS_CACHE.clear()
     
     return f"Configuration updated: API Key Set, Version = {OpenAlgoConfig.version}, Host = {OpenAlgoConfig.host_url}"
 
@@ -898,6 +1739,7 @@ def oa_get_config():
         ["Version", OpenAlgoConfig.version],
         ["Host URL", OpenAlgoConfig.host_url],
         ["Force HTTP Mode", "Enabled" if OpenAlgoConfig.force_http else "Disabled"],
+        ["Quote Cache TTL", f"{OpenAlgoConfig.quote_ttl:g}s"],
         ["Response Format", ResponseConfig.preferred_format],
         ["Status", "Ready for dynamic API calls with HTTPS fallback"]
     ]
@@ -930,20 +1772,94 @@ def oa_set_format(format_type="auto"):
     ResponseConfig.preferred_format = format_type
     return f"Response format set to: {format_type}"
 
+# Static table returned by oa_response_info
+RESPONSE_INFO_TABLE = (
+    ("Feature", "Description"),
+    ("Auto Format Detection", "Automatically chooses best display format"),
+    ("Smart Field Ordering", "Prioritizes important fields first"),
+    ("Price Formatting", "Formats currency values with 2 decimals"),
+    ("Timestamp Conversion", "Converts Unix timestamps to readable dates"),
+    ("Percentage Formatting", "Adds % suffix to percentage fields"),
+    ("Field Labels", "Uses user-friendly column names"),
+    ("Schema Learning", "Adapts to different API response patterns"),
+    ("List/Dict Handling", "Handles response format inconsistencies"),
+    ("Error Processing", "Provides clear error messages")
+)
+
 @func
 def oa_response_info():
     """Get information about the dynamic response system"""
+    return RESPONSE_INFO_TABLE
+
+@func
+@arg("enable", doc='TRUE to stream quotes over WebSocket, FALSE to go back to HTTP polling')
+@arg("ws_url", doc='OpenAlgo WebSocket URL (default: "ws://127.0.0.1:8765")')
+def oa_stream(enable=True, ws_url="ws://127.0.0.1:8765"):
+    """Stream live quotes over OpenAlgo's WebSocket feed instead of polling
+    
+    While streaming, oa_quotes subscribes to each symbol it is called with and
+    returns the latest pushed quote without an HTTP request. Until a quote for
+    a symbol arrives, or when its last quote is more than a second old,
+    oa_quotes falls back to a normal request.
+    If the connection drops, oa_quotes goes back to HTTP requests until
+    oa_stream is called again.
+    
+    Args:
+        enable: True to start streaming, False to stop (default: True)
+        ws_url: WebSocket URL of the OpenAlgo server
+    
+    Returns:
+        Configuration confirmation message
+    """
+    if not enable:
+        stop_quote_stream()
+        return "Quote streaming disabled - oa_quotes uses HTTP requests"
+    
+    api_key = validate_api_key()
+    if not api_key:
+        return "Error: OpenAlgo API Key is not set. Use oa_api()"
+    if not (JS_WEBSOCKET_AVAILABLE or WEBSOCKET_AVAILABLE):
+        return "Error: WebSocket support not available (install websocket-client)"
+    
+    start_quote_stream(_to_str(ws_url), api_key)
+    return f"Quote streaming enabled - connecting to {QuoteStream.url}"
+
+@func
+def oa_cache_clear():
+    """Discard all cached responses so the next calls fetch fresh data
+    
+    Clears cached quotes, funds, holdings, history and intervals. Use it to
+    force a refresh without waiting for the cache entries to expire.
+    
+    Returns:
+        Confirmation message with the number of entries discarded
+    """
+    count = len(ResponseCache.entries) + len(_QUOTE_CACHE)
+    ResponseCache.entries.clear()
+    _QUOTE_CACHE.clear()
+    ResponseCache.hits = ResponseCache.misses = 0
+    return f"Cache cleared: {count} entries discarded"
+
+@func
+def oa_cache_stats():
+    """Show how many requests the response caches have saved
+    
+    Counts lookups in the response cache (funds, holdings, history,
+    intervals, throttled reads) and the quote cache since the last
+    oa_cache_clear().
+    
+    Returns:
+        2D array with cache sizes, hits, misses and hit rate
+    """
+    hits, misses = ResponseCache.hits, ResponseCache.misses
+    lookups = hits + misses
     return [
-        ["Feature", "Description"],
-        ["Auto Format Detection", "Automatically chooses best display format"],
-        ["Smart Field Ordering", "Prioritizes important fields first"],
-        ["Price Formatting", "Formats currency values with 2 decimals"],
-        ["Timestamp Conversion", "Converts Unix timestamps to readable dates"],
-        ["Percentage Formatting", "Adds % suffix to percentage fields"],
-        ["Field Labels", "Uses user-friendly column names"],
-        ["Schema Learning", "Adapts to different API response patterns"],
-        ["List/Dict Handling", "Handles response format inconsistencies"],
-        ["Error Processing", "Provides clear error messages"]
+        ["Cache", "Value"],
+        ["Cached Responses", len(ResponseCache.entries)],
+        ["Cached Quotes", len(_QUOTE_CACHE)],
+        ["Hits", hits],
+        ["Misses", misses],
+        ["Hit Rate", f"{hits / lookups:.1%}" if lookups else "N/A"]
     ]
 
 @func
@@ -962,6 +1878,19 @@ def oa_force_http(enable=True):
     else:
         return "Forced HTTP mode disabled - HTTPS URLs will be used as-is"
 
+# oa_test_https_support rows fixed by the runtime environment, computed once
+HTTPS_SUPPORT_ROWS = (
+    ("Test", "Result", "Recommendation"),
+    ("SSL Module", "✓ Available", "HTTPS should work") if SSL_AVAILABLE
+    else ("SSL Module", "✗ Not Available", "Use HTTP or force_http mode"),
+    ("Pyodide Environment", "✓ Detected", "WebAssembly optimizations enabled") if PYODIDE_AVAILABLE
+    else ("Pyodide Environment", "✗ Standard Python", "Standard HTTP/HTTPS support")
+)
+FORCE_HTTP_ROWS = {
+    True: ("Force HTTP Mode", "✓ Enabled", "All requests will use HTTP"),
+    False: ("Force HTTP Mode", "✗ Disabled", "HTTPS will be attempted first")
+}
+
 @func
 def oa_test_https_support():
     """Test if HTTPS is supported in the current environment
@@ -969,33 +1898,26 @@ def oa_test_https_support():
     Returns:
         Test results and recommendations
     """
-    result = [
-        ["Test", "Result", "Recommendation"]
+    return [
+        *HTTPS_SUPPORT_ROWS,
+        FORCE_HTTP_ROWS[OpenAlgoConfig.force_http],
+        ("Current Host Protocol", "HTTPS" if OpenAlgoConfig.host_url.startswith('https://') else "HTTP", "Configure with oa_api()")
     ]
-    
-    # Test SSL availability
-    if SSL_AVAILABLE:
-        result.append(["SSL Module", "✓ Available", "HTTPS should work"])
-    else:
-        result.append(["SSL Module", "✗ Not Available", "Use HTTP or force_http mode"])
-    
-    # Test Pyodide environment
-    if PYODIDE_AVAILABLE:
-        result.append(["Pyodide Environment", "✓ Detected", "WebAssembly optimizations enabled"])
-    else:
-        result.append(["Pyodide Environment", "✗ Standard Python", "Standard HTTP/HTTPS support"])
-    
-    # Test current configuration
-    if OpenAlgoConfig.force_http:
-        result.append(["Force HTTP Mode", "✓ Enabled", "All requests will use HTTP"])
-    else:
-        result.append(["Force HTTP Mode", "✗ Disabled", "HTTPS will be attempted first"])
-    
-    # Show current host protocol
-    host_protocol = "HTTPS" if OpenAlgoConfig.host_url.startswith('https://') else "HTTP"
-    result.append(["Current Host Protocol", host_protocol, "Configure with oa_api()"])
-    
-    return result
+
+# Static table returned by oa_connection_help
+CONNECTION_HELP_TABLE = (
+    ("Issue", "Solution"),
+    ("URL Error: unknown url type: https", "Use oa_force_http(True) or change host to HTTP"),
+    ("HTTPS not working", "Run oa_test_https_support() for diagnostics"),
+    ("Functions return #VALUE!", "Check oa_test_connection() and CORS settings"),
+    ("NetworkError in browser", "Add https://addin.xlwings.org to CORS_ALLOWED_ORIGINS"),
+    ("Connection timeout", "Check if OpenAlgo server is running"),
+    ("HTTP 401 Unauthorized", "Verify API key with oa_get_config()"),
+    ("JSON Decode Error", "Check server response format"),
+    ("Protocol fallback active", "System automatically trying HTTP after HTTPS fails"),
+    ("Best practice", "Use HTTP (port 5000) for local development"),
+    ("Production setup", "Configure CORS properly for HTTPS")
+)
 
 @func
 def oa_connection_help():
@@ -1004,25 +1926,13 @@ def oa_connection_help():
     Returns:
         Help information and troubleshooting steps
     """
-    return [
-        ["Issue", "Solution"],
-        ["URL Error: unknown url type: https", "Use oa_force_http(True) or change host to HTTP"],
-        ["HTTPS not working", "Run oa_test_https_support() for diagnostics"],
-        ["Functions return #VALUE!", "Check oa_test_connection() and CORS settings"],
-        ["NetworkError in browser", "Add https://addin.xlwings.org to CORS_ALLOWED_ORIGINS"],
-        ["Connection timeout", "Check if OpenAlgo server is running"],
-        ["HTTP 401 Unauthorized", "Verify API key with oa_get_config()"],
-        ["JSON Decode Error", "Check server response format"],
-        ["Protocol fallback active", "System automatically trying HTTP after HTTPS fails"],
-        ["Best practice", "Use HTTP (port 5000) for local development"],
-        ["Production setup", "Configure CORS properly for HTTPS"]
-    ]
+    return CONNECTION_HELP_TABLE
 
 # Market Data Functions
 @func(help_url="https://docs.openalgo.in/api-documentation/v1/data-api/quotes")
 @arg("symbol", doc='Trading symbol (e.g., "RELIANCE", "INFY", "NIFTY50")')
 @arg("exchange", doc='Exchange: "NSE" (stocks), "NFO" (F&O), "BSE", "MCX", "NSE_INDEX"')
-def oa_quotes(symbol, exchange):
+async def oa_quotes(symbol, exchange):
     """Get real-time market quotes for a trading symbol
     
     Retrieves live market data including last traded price, bid/ask prices,
@@ -1042,26 +1952,162 @@ def oa_quotes(symbol, exchange):
         
     Note: Requires API configuration via oa_api() function
     """
-    if not validate_api_key():
-        return format_error("OpenAlgo API Key is not set. Use oa_api()")
+    api_key = validate_api_key()
+    if not api_key:
+        return API_KEY_MISSING_ERROR
     
-    endpoint = f"{OpenAlgoConfig.host_url}/api/{OpenAlgoConfig.version}/quotes"
+    endpoint = OpenAlgoConfig.url("quotes")
     payload = {
-        "apikey": OpenAlgoConfig.api_key,
-        "symbol": str(symbol),
-        "exchange": str(exchange)
+        "apikey": api_key,
+        "symbol": _to_str(symbol),
+        "exchange": _to_str(exchange)
     }
     
-    response = post_request(endpoint, payload)
+    response = streamed_quote(payload["symbol"], payload["exchange"]) or await cached_market_data_request(endpoint, payload)
     
     # Use dynamic response processor with custom title
     custom_title = f"{symbol} ({exchange})"
     return process_api_response(response, endpoint, custom_title)
 
+def flatten_range(values, keep_blank=False):
+    """Flatten an Excel range (scalar, row, column or 2D block) into a list of stripped strings
+    
+    Blank cells are dropped, or kept as empty strings when keep_blank is True.
+    Excel passes numbers as floats, so whole numbers such as BSE scrip codes
+    become "500325", not "500325.0".
+    """
+    if not isinstance(values, (list, tuple)):
+        values = [values]
+    cells = []
+    for value in values:
+        cells.extend(value if isinstance(value, (list, tuple)) else [value])
+    cells = [
+        "" if cell is None
+        else str(int(cell)) if isinstance(cell, float) and cell.is_integer()
+        else _to_str(cell).strip()
+        for cell in cells
+    ]
+    return cells if keep_blank else [cell for cell in cells if cell]
+
+@func(help_url="https://docs.openalgo.in/api-documentation/v1/data-api/multiquotes")
+@arg("symbols", doc='Range of trading symbols, e.g. A2:A50')
+@arg("exchange", doc='Exchange for all symbols: "NSE", "NFO", "BSE", "MCX", "NSE_INDEX"')
+async def oa_quotes_batch(symbols, exchange):
+    """Get real-time quotes for a whole range of symbols in one request
+    
+    Sends a single multiquotes request for every symbol in the range instead
+    of one request per cell. Quotes still fresh in the cache are not requested
+    again, and quotes fetched here are reused by oa_quotes.
+    
+    Args:
+        symbols: Range of trading symbols (blank cells are skipped)
+        exchange: Exchange where the symbols are traded
+        
+    Returns:
+        2D array with one row per symbol, in the order of the range
+        
+    Examples:
+        =oa_quotes_batch(A2:A50, "NSE")   # Quotes for a watchlist column
+        
+    Note: Falls back to parallel single-symbol requests on servers without multiquotes
+    """
+    api_key = validate_api_key()
+    if not api_key:
+        return API_KEY_MISSING_ERROR
+    
+    exchange = _to_str(exchange)
+    symbol_list = flatten_range(symbols)
+    if not symbol_list:
+        return format_error("No symbols given")
+    
+    keys = [(symbol, exchange) for symbol in symbol_list]
+    quotes = await fetch_quotes(api_key, keys)
+    
+    rows = []
+    for symbol, exchange in keys:
+        response = quotes[(symbol, exchange)]
+        row = {"symbol": symbol, "exchange": exchange}
+        if "error" in response:
+            row["error"] = response["error"]
+        elif isinstance(response.get("data"), dict):
+            row.update(response["data"])
+        rows.append(row)
+    
+    return format_table_data(rows, "quotes")
+
+# Default columns of oa_quotes_range; change_percent is derived from ltp and prev_close
+QUOTE_RANGE_FIELDS = ("ltp", "bid", "ask", "volume", "change_percent")
+
+def quote_range_row(data, fields):
+    """Pick the requested quote fields as raw values, blank when missing"""
+    row = []
+    for field in fields:
+        if field == "change_percent":
+            try:
+                row.append(round((data["ltp"] - data["prev_close"]) / data["prev_close"] * 100, 2))
+            except (KeyError, TypeError, ZeroDivisionError):
+                row.append("")
+        else:
+            value = data.get(field)
+            row.append("" if value is None else value)
+    return row
+
+@func(help_url="https://docs.openalgo.in/api-documentation/v1/data-api/multiquotes")
+@arg("symbols", doc='Range of trading symbols next to which the quotes are spilled, e.g. A2:A50')
+@arg("exchange", doc='Exchange for all symbols: "NSE", "NFO", "BSE", "MCX", "NSE_INDEX"')
+@arg("fields", doc='Comma-separated quote fields (default: "ltp,bid,ask,volume,change_percent")')
+async def oa_quotes_range(symbols, exchange, fields=None):
+    """Get a matrix of quote values for a range of symbols from one cell
+    
+    Returns one row per cell of the range, in range order, with one column per
+    field and no header, so the result lines up beside the symbol column.
+    Values stay numeric for use in formulas. Blank cells give blank rows.
+    All symbols are fetched together like oa_quotes_batch.
+    
+    Args:
+        symbols: Range of trading symbols
+        exchange: Exchange where the symbols are traded
+        fields: Quote fields to return; change_percent is computed from ltp and prev_close
+        
+    Returns:
+        2D array with one row per cell and one column per field
+        
+    Examples:
+        =oa_quotes_range(A2:A50, "NSE")                  # LTP, bid, ask, volume, change %
+        =oa_quotes_range(A2:A50, "NSE", "ltp,high,low")  # Selected fields
+    """
+    api_key = validate_api_key()
+    if not api_key:
+        return API_KEY_MISSING_ERROR
+    
+    exchange = _to_str(exchange)
+    field_list = QUOTE_RANGE_FIELDS
+    if fields:
+        field_list = tuple(f.strip().lower() for f in _to_str(fields).split(",") if f.strip()) or QUOTE_RANGE_FIELDS
+    
+    cells = flatten_range(symbols, keep_blank=True)
+    keys = [(symbol, exchange) for symbol in cells if symbol]
+    if not keys:
+        return format_error("No symbols given")
+    quotes = await fetch_quotes(api_key, keys)
+    
+    blank = [""] * len(field_list)
+    rows = []
+    for symbol in cells:
+        response = quotes[(symbol, exchange)] if symbol else None
+        if response is None:
+            rows.append(blank)
+        elif "error" in response:
+            rows.append([f"Error: {response['error']}"] + blank[1:])
+        else:
+            data = response.get("data")
+            rows.append(quote_range_row(data, field_list) if isinstance(data, dict) else blank)
+    return rows
+
 @func(help_url="https://docs.openalgo.in/api-documentation/v1/data-api/depth")
 @arg("symbol", doc='Trading symbol (e.g., "RELIANCE", "INFY")')
 @arg("exchange", doc='Exchange: "NSE", "NFO", "BSE", "MCX"')
-def oa_depth(symbol, exchange):
+async def oa_depth(symbol, exchange):
     """Get market depth (order book) for a trading symbol
     
     Retrieves bid/ask prices and quantities showing market depth.
@@ -1080,17 +2126,18 @@ def oa_depth(symbol, exchange):
         
     Note: Shows multiple price levels with quantities
     """
-    if not validate_api_key():
-        return format_error("OpenAlgo API Key is not set. Use oa_api()")
+    api_key = validate_api_key()
+    if not api_key:
+        return API_KEY_MISSING_ERROR
     
-    endpoint = f"{OpenAlgoConfig.host_url}/api/{OpenAlgoConfig.version}/depth"
+    endpoint = OpenAlgoConfig.url("depth")
     payload = {
-        "apikey": OpenAlgoConfig.api_key,
-        "symbol": str(symbol),
-        "exchange": str(exchange)
+        "apikey": api_key,
+        "symbol": _to_str(symbol),
+        "exchange": _to_str(exchange)
     }
     
-    response = post_request(endpoint, payload)
+    response = await cached_market_data_request(endpoint, payload)
     if "error" in response:
         return format_error(response["error"])
     
@@ -1102,21 +2149,36 @@ def oa_depth(symbol, exchange):
     asks = data.get("asks", [])
     bids = data.get("bids", [])
     
-    result = [["Ask Price", "Ask Qty", "Bid Price", "Bid Qty"]]
+    result = [("Ask Price", "Ask Qty", "Bid Price", "Bid Qty")]
     
-    max_depth = max(len(asks), len(bids))
-    for i in range(max_depth):
-        ask_price = smart_format_value("price", asks[i]["price"]) if i < len(asks) else ""
-        ask_qty = asks[i]["quantity"] if i < len(asks) else ""
-        bid_price = smart_format_value("price", bids[i]["price"]) if i < len(bids) else ""
-        bid_qty = bids[i]["quantity"] if i < len(bids) else ""
-        
-        result.append([ask_price, str(ask_qty), bid_price, str(bid_qty)])
+    # Format each column in one pass; the shorter side is padded with blanks
+    price = resolve_formatter("price")
+    result.extend(zip_longest(
+        [format_cell(price, level["price"]) for level in asks],
+        [str(level["quantity"]) for level in asks],
+        [format_cell(price, level["price"]) for level in bids],
+        [str(level["quantity"]) for level in bids],
+        fillvalue=""
+    ))
     
     return result
 
+# Intervals shown by oa_intervals when the server returns none
+DEFAULT_INTERVALS_TABLE = (
+    ("Category", "Interval"),
+    ("Minutes", "1m"),
+    ("Minutes", "5m"),
+    ("Minutes", "15m"),
+    ("Minutes", "30m"),
+    ("Hours", "1h"),
+    ("Hours", "4h"),
+    ("Daily", "1d"),
+    ("Weekly", "1w"),
+    ("Monthly", "1M")
+)
+
 @func(help_url="https://docs.openalgo.in/api-documentation/v1/data-api/intervals")
-def oa_intervals():
+async def oa_intervals():
     """Get available time intervals for historical data
     
     Returns list of supported time intervals that can be used
@@ -1130,37 +2192,27 @@ def oa_intervals():
         
     Note: Use these intervals with oa_history() function
     """
-    if not validate_api_key():
-        return format_error("OpenAlgo API Key is not set. Use oa_api()")
+    api_key = validate_api_key()
+    if not api_key:
+        return API_KEY_MISSING_ERROR
     
-    endpoint = f"{OpenAlgoConfig.host_url}/api/{OpenAlgoConfig.version}/intervals"
-    payload = {"apikey": OpenAlgoConfig.api_key}
+    endpoint = OpenAlgoConfig.url("intervals")
+    payload = {"apikey": api_key}
     
-    response = post_request(endpoint, payload)
+    response = await post_request_async(endpoint, payload)
     
     # Try dynamic processing first
     result = process_api_response(response, endpoint)
     
     # If no data from API, return default intervals
     if result == [["No data received"]]:
-        return [
-            ["Category", "Interval"],
-            ["Minutes", "1m"],
-            ["Minutes", "5m"],
-            ["Minutes", "15m"],
-            ["Minutes", "30m"],
-            ["Hours", "1h"],
-            ["Hours", "4h"],
-            ["Daily", "1d"],
-            ["Weekly", "1w"],
-            ["Monthly", "1M"]
-        ]
+        return DEFAULT_INTERVALS_TABLE
     
     return result
 
 # Account Management Functions
 @func(help_url="https://docs.openalgo.in/api-documentation/v1/account/funds")
-def oa_funds():
+async def oa_funds():
     """Get available trading funds and account balance
     
     Retrieves current account balance, available margin, and fund details
@@ -1174,19 +2226,20 @@ def oa_funds():
         
     Note: Shows real account balance - verify before trading
     """
-    if not validate_api_key():
-        return format_error("OpenAlgo API Key is not set. Use oa_api()")
+    api_key = validate_api_key()
+    if not api_key:
+        return API_KEY_MISSING_ERROR
     
-    endpoint = f"{OpenAlgoConfig.host_url}/api/{OpenAlgoConfig.version}/funds"
-    payload = {"apikey": OpenAlgoConfig.api_key}
+    endpoint = OpenAlgoConfig.url("funds")
+    payload = {"apikey": api_key}
     
-    response = post_request(endpoint, payload)
+    response = await post_request_async(endpoint, payload)
     
     # Use dynamic response processor
     return process_api_response(response, endpoint)
 
 @func(help_url="https://docs.openalgo.in/api-documentation/v1/account/orderbook")
-def oa_orderbook():
+async def oa_orderbook():
     """Get current order book (pending/active orders)
     
     Retrieves all pending, partially filled, and recently executed orders
@@ -1200,19 +2253,20 @@ def oa_orderbook():
         
     Note: Updates in real-time - refresh to see latest status
     """
-    if not validate_api_key():
-        return format_error("OpenAlgo API Key is not set. Use oa_api()")
+    api_key = validate_api_key()
+    if not api_key:
+        return API_KEY_MISSING_ERROR
     
-    endpoint = f"{OpenAlgoConfig.host_url}/api/{OpenAlgoConfig.version}/orderbook"
-    payload = {"apikey": OpenAlgoConfig.api_key}
+    endpoint = OpenAlgoConfig.url("orderbook")
+    payload = {"apikey": api_key}
     
-    response = post_request(endpoint, payload)
+    response = await post_request_async(endpoint, payload)
     
     # Use dynamic response processor
     return process_api_response(response, endpoint)
 
 @func(help_url="https://docs.openalgo.in/api-documentation/v1/account/tradebook")
-def oa_tradebook():
+async def oa_tradebook():
     """Get trade book (executed trades history)
     
     Retrieves all completed trades and executions from your account.
@@ -1226,19 +2280,20 @@ def oa_tradebook():
         
     Note: Shows actual executed trades with final prices
     """
-    if not validate_api_key():
-        return format_error("OpenAlgo API Key is not set. Use oa_api()")
+    api_key = validate_api_key()
+    if not api_key:
+        return API_KEY_MISSING_ERROR
     
-    endpoint = f"{OpenAlgoConfig.host_url}/api/{OpenAlgoConfig.version}/tradebook"
-    payload = {"apikey": OpenAlgoConfig.api_key}
+    endpoint = OpenAlgoConfig.url("tradebook")
+    payload = {"apikey": api_key}
     
-    response = post_request(endpoint, payload)
+    response = await post_request_async(endpoint, payload)
     
     # Use dynamic response processor
     return process_api_response(response, endpoint)
 
 @func(help_url="https://docs.openalgo.in/api-documentation/v1/account/positionbook")
-def oa_positionbook():
+async def oa_positionbook():
     """Get current position book (open positions)
     
     Retrieves all current open positions in your account showing
@@ -1252,19 +2307,20 @@ def oa_positionbook():
         
     Note: Shows real-time P&L - values change with market prices
     """
-    if not validate_api_key():
-        return format_error("OpenAlgo API Key is not set. Use oa_api()")
+    api_key = validate_api_key()
+    if not api_key:
+        return API_KEY_MISSING_ERROR
     
-    endpoint = f"{OpenAlgoConfig.host_url}/api/{OpenAlgoConfig.version}/positionbook"
-    payload = {"apikey": OpenAlgoConfig.api_key}
+    endpoint = OpenAlgoConfig.url("positionbook")
+    payload = {"apikey": api_key}
     
-    response = post_request(endpoint, payload)
+    response = await post_request_async(endpoint, payload)
     
     # Use dynamic response processor
     return process_api_response(response, endpoint)
 
 @func(help_url="https://docs.openalgo.in/api-documentation/v1/account/holdings")
-def oa_holdings():
+async def oa_holdings():
     """Get long-term holdings and investments
     
     Retrieves all stocks and securities held in your demat account
@@ -1278,23 +2334,123 @@ def oa_holdings():
         
     Note: Different from positions - these are delivery holdings
     """
-    if not validate_api_key():
-        return format_error("OpenAlgo API Key is not set. Use oa_api()")
+    api_key = validate_api_key()
+    if not api_key:
+        return API_KEY_MISSING_ERROR
     
-    endpoint = f"{OpenAlgoConfig.host_url}/api/{OpenAlgoConfig.version}/holdings"
-    payload = {"apikey": OpenAlgoConfig.api_key}
+    endpoint = OpenAlgoConfig.url("holdings")
+    payload = {"apikey": api_key}
     
-    response = post_request(endpoint, payload)
+    response = await post_request_async(endpoint, payload)
     
     # Use dynamic response processor
     return process_api_response(response, endpoint)
 
+@func(help_url="https://docs.openalgo.in/api-documentation/v1")
+async def oa_account_snapshot():
+    """Get funds, orders, trades, positions and holdings in one call
+    
+    Fetches all five account endpoints concurrently and stacks the results
+    into one block with a heading above each section. Waits only as long as
+    the slowest endpoint instead of the sum of all five.
+    
+    Returns:
+        2D array with one section per account endpoint
+        
+    Example:
+        =oa_account_snapshot()  # Full account overview in a single cell
+        
+    Note: Each section is formatted the same way as its own oa_* function
+    """
+    api_key = validate_api_key()
+    if not api_key:
+        return API_KEY_MISSING_ERROR
+    
+    sections = [
+        ("FUNDS", "funds"),
+        ("ORDER BOOK", "orderbook"),
+        ("TRADE BOOK", "tradebook"),
+        ("POSITION BOOK", "positionbook"),
+        ("HOLDINGS", "holdings")
+    ]
+    endpoints = [OpenAlgoConfig.url(route) for _, route in sections]
+    responses = await post_requests_batch_async((endpoint, {"apikey": api_key}) for endpoint in endpoints)
+    
+    result = []
+    for (heading, _), endpoint, response in zip(sections, endpoints, responses):
+        if result:
+            result.append([""])
+        result.append([heading])
+        result.extend(process_api_response(response, endpoint))
+    
+    # Excel needs a rectangular array
+    width = max(len(row) for row in result)
+    return [list(row) + [""] * (width - len(row)) for row in result]
+
 # Order Management Functions
-def handle_optional_param(param, default="0"):
-    """Handle Excel optional parameters - convert None to default"""
-    if param is None or param == "":
-        return default
-    return str(param)
+def order_numbers(**params):
+    """Normalize numeric order parameters in one pass
+    
+    Blank/omitted values become "0", numbers stay numeric (Excel passes every
+    number as float, so whole numbers are sent as integers) and anything else
+    is sent as a string.
+    """
+    return {
+        name: "0" if value is None or value == "" else
+              (int(value) if value.is_integer() else value) if value.__class__ is float else
+              value if value.__class__ is int else _to_str(value)
+        for name, value in params.items()
+    }
+
+# Accepted order ticket values, checked locally before an order request is sent
+VALID_ACTIONS = frozenset(("BUY", "SELL"))
+VALID_EXCHANGES = frozenset(("NSE", "BSE", "NFO", "BFO", "CDS", "BCD", "MCX", "NCDEX"))
+VALID_PRICETYPES = frozenset(("MARKET", "LIMIT", "SL", "SL-M"))
+VALID_PRODUCTS = frozenset(("MIS", "CNC", "NRML"))
+
+def validate_order_ticket(symbol, action, exchange, pricetype, product, quantity):
+    """Check order parameters locally; return an error message, or None if they look valid"""
+    if not _to_str(symbol).strip():
+        return "Symbol is required"
+    if _to_str(action).upper() not in VALID_ACTIONS:
+        return f"Invalid action '{action}'. Use BUY or SELL"
+    if _to_str(exchange).upper() not in VALID_EXCHANGES:
+        return f"Invalid exchange '{exchange}'. Use one of: {', '.join(sorted(VALID_EXCHANGES))}"
+    if _to_str(pricetype).upper() not in VALID_PRICETYPES:
+        return f"Invalid pricetype '{pricetype}'. Use MARKET, LIMIT, SL or SL-M"
+    if _to_str(product).upper() not in VALID_PRODUCTS:
+        return f"Invalid product '{product}'. Use MIS, CNC or NRML"
+    try:
+        if float(quantity) <= 0:
+            return "Quantity must be greater than 0"
+    except (ValueError, TypeError):
+        return f"Invalid quantity '{quantity}'"
+    return None
+
+def order_ticket_payload(api_key, strategy, symbol, action, exchange, pricetype, product,
+                         quantity, price, trigger_price, disclosed_quantity, **identifiers):
+    """Build the JSON payload shared by placeorder and modifyorder"""
+    return {
+        "apikey": api_key,
+        "strategy": _to_str(strategy),
+        **identifiers,
+        "symbol": _to_str(symbol),
+        "action": _to_str(action).upper(),
+        "exchange": _to_str(exchange).upper(),
+        "pricetype": _to_str(pricetype).upper(),
+        "product": _to_str(product).upper(),
+        **order_numbers(quantity=quantity, price=price, trigger_price=trigger_price,
+                        disclosed_quantity=disclosed_quantity)
+    }
+
+def order_status_rows(response, default_message):
+    """Format a modify/cancel response as Status and Message rows"""
+    if "error" in response:
+        return format_error(response["error"])
+    
+    status = response.get("status", "Unknown")
+    message = response.get("message", default_message)
+    return [["Status", str(status)], ["Message", str(message)]]
 
 @func(help_url="https://docs.openalgo.in/api-documentation/v1/orders-api/placeorder")
 @arg("strategy", doc='Strategy name for order identification (e.g., "MyStrategy", "Scalping")')
@@ -1337,25 +2493,19 @@ def oa_placeorder(strategy, symbol, action, exchange, pricetype, product, quanti
     ⚠️ CRITICAL WARNING: This places real orders with real money!
     Always verify symbol, quantity, and price before execution.
     """
-    if not validate_api_key():
-        return format_error("OpenAlgo API Key is not set. Use oa_api()")
+    api_key = validate_api_key()
+    if not api_key:
+        return API_KEY_MISSING_ERROR
     
-    endpoint = f"{OpenAlgoConfig.host_url}/api/{OpenAlgoConfig.version}/placeorder"
-    payload = {
-        "apikey": OpenAlgoConfig.api_key,
-        "strategy": str(strategy),
-        "symbol": str(symbol),
-        "action": str(action),
-        "exchange": str(exchange),
-        "pricetype": str(pricetype),
-        "product": str(product),
-        "quantity": handle_optional_param(quantity, "0"),
-        "price": handle_optional_param(price, "0"),
-        "trigger_price": handle_optional_param(trigger_price, "0"),
-        "disclosed_quantity": handle_optional_param(disclosed_quantity, "0")
-    }
+    # Reject invalid tickets here instead of paying a round trip to learn it
+    ticket_error = validate_order_ticket(symbol, action, exchange, pricetype, product, quantity)
+    if ticket_error:
+        return format_error(ticket_error)
     
-    response = post_request(endpoint, payload)
+    payload = order_ticket_payload(api_key, strategy, symbol, action, exchange, pricetype, product,
+                                   quantity, price, trigger_price, disclosed_quantity)
+    
+    response = post_request(OpenAlgoConfig.url("placeorder"), payload)
     if "error" in response:
         return format_error(response["error"])
     
@@ -1402,32 +2552,21 @@ def oa_modifyorder(strategy, order_id, symbol, action, exchange, quantity, price
         
     Note: Get order_id from oa_orderbook() or oa_placeorder() response
     """
-    if not validate_api_key():
-        return format_error("OpenAlgo API Key is not set. Use oa_api()")
+    api_key = validate_api_key()
+    if not api_key:
+        return API_KEY_MISSING_ERROR
     
-    endpoint = f"{OpenAlgoConfig.host_url}/api/{OpenAlgoConfig.version}/modifyorder"
-    payload = {
-        "apikey": OpenAlgoConfig.api_key,
-        "strategy": str(strategy),
-        "orderid": str(order_id),
-        "symbol": str(symbol),
-        "action": str(action),
-        "exchange": str(exchange),
-        "quantity": handle_optional_param(quantity, "0"),
-        "pricetype": str(pricetype),
-        "product": str(product),
-        "price": handle_optional_param(price, "0"),
-        "trigger_price": handle_optional_param(trigger_price, "0"),
-        "disclosed_quantity": handle_optional_param(disclosed_quantity, "0")
-    }
+    # Reject invalid tickets here instead of paying a round trip to learn it
+    ticket_error = validate_order_ticket(symbol, action, exchange, pricetype, product, quantity)
+    if ticket_error:
+        return format_error(ticket_error)
     
-    response = post_request(endpoint, payload)
-    if "error" in response:
-        return format_error(response["error"])
+    payload = order_ticket_payload(api_key, strategy, symbol, action, exchange, pricetype, product,
+                                   quantity, price, trigger_price, disclosed_quantity,
+                                   orderid=_to_str(order_id))
     
-    status = response.get("status", "Unknown")
-    message = response.get("message", "Order modification request sent")
-    return [["Status", str(status)], ["Message", str(message)]]
+    response = post_request(OpenAlgoConfig.url("modifyorder"), payload)
+    return order_status_rows(response, "Order modification request sent")
 
 @func(help_url="https://docs.openalgo.in/api-documentation/v1/orders-api/cancelorder")
 @arg("strategy", doc='Strategy name that placed the original order')
@@ -1451,23 +2590,33 @@ def oa_cancelorder(strategy, order_id):
         
     Note: Get order_id from oa_orderbook() function
     """
-    if not validate_api_key():
-        return format_error("OpenAlgo API Key is not set. Use oa_api()")
+    api_key = validate_api_key()
+    if not api_key:
+        return API_KEY_MISSING_ERROR
     
-    endpoint = f"{OpenAlgoConfig.host_url}/api/{OpenAlgoConfig.version}/cancelorder"
+    endpoint = OpenAlgoConfig.url("cancelorder")
     payload = {
-        "apikey": OpenAlgoConfig.api_key,
-        "strategy": str(strategy),
-        "orderid": str(order_id)
+        "apikey": api_key,
+        "strategy": _to_str(strategy),
+        "orderid": _to_str(order_id)
     }
     
     response = post_request(endpoint, payload)
-    if "error" in response:
-        return format_error(response["error"])
+    return order_status_rows(response, "Order cancellation request sent")
+
+# Order status fields holding epoch timestamps
+ORDER_TIMESTAMP_FIELDS = frozenset(("timestamp", "date", "time"))
+
+def format_order_timestamp(value):
+    """Format an epoch timestamp as 'YYYY-MM-DD HH:MM:SS' (f-string is cheaper than strftime)
     
-    status = response.get("status", "Unknown")
-    message = response.get("message", "Order cancellation request sent")
-    return [["Status", str(status)], ["Message", str(message)]]
+    Values the platform cannot convert are returned as plain strings.
+    """
+    try:
+        dt = datetime.fromtimestamp(value)
+    except (ValueError, OverflowError, OSError):
+        return str(value)
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} {dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
 
 @func(help_url="https://docs.openalgo.in/api-documentation/v1/orders-api/orderstatus")
 @arg("strategy", doc='Strategy name that placed the order')
@@ -1491,14 +2640,15 @@ def oa_orderstatus(strategy, order_id):
         
     Note: Shows real-time status - refresh to see latest updates
     """
-    if not validate_api_key():
-        return format_error("OpenAlgo API Key is not set. Use oa_api()")
+    api_key = validate_api_key()
+    if not api_key:
+        return API_KEY_MISSING_ERROR
     
-    endpoint = f"{OpenAlgoConfig.host_url}/api/{OpenAlgoConfig.version}/orderstatus"
+    endpoint = OpenAlgoConfig.url("orderstatus")
     payload = {
-        "apikey": OpenAlgoConfig.api_key,
-        "strategy": str(strategy),
-        "orderid": str(order_id)
+        "apikey": api_key,
+        "strategy": _to_str(strategy),
+        "orderid": _to_str(order_id)
     }
     
     response = post_request(endpoint, payload)
@@ -1510,57 +2660,89 @@ def oa_orderstatus(strategy, order_id):
         return format_error("No order status data found")
     
     # Convert order details to key-value format
-    result = []
-    for key, value in data.items():
-        # Handle timestamp conversion
-        if key.lower() in ['timestamp', 'date', 'time'] and isinstance(value, (int, float)):
-            try:
-                dt = datetime.fromtimestamp(value)
-                value = dt.strftime('%Y-%m-%d %H:%M:%S')
-            except (ValueError, TypeError, OSError):
-                pass
-        result.append([str(key), str(value)])
-    
-    return result
+    return [
+        [str(key), format_order_timestamp(value)
+         if key.lower() in ORDER_TIMESTAMP_FIELDS and isinstance(value, (int, float)) else str(value)]
+        for key, value in data.items()
+    ]
 
 # Utility Functions
+# Static table returned by oa_all_functions
+ALL_FUNCTIONS_TABLE = (
+    ("Category", "Function", "Description"),
+    ("Setup", "oa_api(api_key, version, host_url)", "Set API configuration"),
+    ("Setup", "oa_get_config()", "View current configuration"),
+    ("Setup", "oa_set_format(format_type)", "🆕 Set response format preference"),
+    ("Setup", "oa_response_info()", "🆕 Learn about dynamic response features"),
+    ("Setup", "get_status()", "Check system status"),
+    ("Setup", "oa_stream(enable, ws_url)", "Stream quotes over WebSocket instead of polling"),
+    ("Setup", "oa_cache_clear()", "Discard cached responses and fetch fresh data"),
+    ("Setup", "oa_cache_stats()", "Show cache sizes, hits and hit rate"),
+    ("Debug", "oa_debug_last_request()", "Show last HTTP request details"),
+    ("Debug", "oa_debug_last_response()", "Show last HTTP response details"),
+    ("Debug", "oa_debug_full_log()", "Show complete request/response log"),
+    ("Debug", "oa_set_verbose(enable)", "Print full payloads/responses to the console"),
+    ("Market Data", "oa_quotes(symbol, exchange)", "🔄 Get real-time quotes - AUTO FORMAT"),
+    ("Market Data", "oa_quotes_batch(symbols, exchange)", "Quotes for a range of symbols in one request"),
+    ("Market Data", "oa_quotes_range(symbols, exchange, fields)", "Matrix of quote values beside a symbol range"),
+    ("Market Data", "oa_depth(symbol, exchange)", "Get market depth"),
+    ("Market Data", "oa_history(symbol, exchange, interval, start, end)", "Get historical data"),
+    ("Market Data", "oa_intervals()", "🔄 Get available intervals - AUTO FORMAT"),
+    ("Account", "oa_funds()", "🔄 Get account funds - AUTO FORMAT"),
+    ("Account", "oa_orderbook()", "🔄 Get order book - AUTO FORMAT"),
+    ("Account", "oa_tradebook()", "🔄 Get trade book - AUTO FORMAT"),
+    ("Account", "oa_positionbook()", "🔄 Get position book - AUTO FORMAT"),
+    ("Account", "oa_holdings()", "🔄 Get holdings - AUTO FORMAT"),
+    ("Account", "oa_account_snapshot()", "All five account views fetched in parallel"),
+    ("Orders", "oa_placeorder(...)", "Place order"),
+    ("Orders", "oa_modifyorder(...)", "Modify order"),
+    ("Orders", "oa_cancelorder(strategy, order_id)", "Cancel order"),
+    ("Orders", "oa_orderstatus(strategy, order_id)", "Get order status"),
+    ("Help", "oa_all_functions()", "This enhanced function list"),
+    ("Help", "oa_test_connection()", "Test API connection"),
+    ("", "", ""),
+    ("🆕 NEW FEATURES", "", ""),
+    ("Dynamic Formatting", "All functions auto-adapt", "Handles list/dict format changes"),
+    ("Smart Field Ordering", "Important fields first", "Symbol, price, quantity prioritized"),
+    ("Price Formatting", "Auto currency format", "Prices show as 123.45"),
+    ("Timestamp Conversion", "Readable dates", "Unix timestamps → 2024-06-22 14:30:00"),
+    ("Field Labels", "User-friendly names", "ltp → Last Trade Price"),
+    ("Error Handling", "Clear error messages", "Better validation and feedback")
+)
+
 @func
 def oa_all_functions():
     """List all available OpenAlgo functions with new dynamic features"""
-    return [
-        ["Category", "Function", "Description"],
-        ["Setup", "oa_api(api_key, version, host_url)", "Set API configuration"],
-        ["Setup", "oa_get_config()", "View current configuration"],
-        ["Setup", "oa_set_format(format_type)", "🆕 Set response format preference"],
-        ["Setup", "oa_response_info()", "🆕 Learn about dynamic response features"],
-        ["Setup", "get_status()", "Check system status"],
-        ["Debug", "oa_debug_last_request()", "Show last HTTP request details"],
-        ["Debug", "oa_debug_last_response()", "Show last HTTP response details"],
-        ["Debug", "oa_debug_full_log()", "Show complete request/response log"],
-        ["Market Data", "oa_quotes(symbol, exchange)", "🔄 Get real-time quotes - AUTO FORMAT"],
-        ["Market Data", "oa_depth(symbol, exchange)", "Get market depth"],
-        ["Market Data", "oa_history(symbol, exchange, interval, start, end)", "Get historical data"],
-        ["Market Data", "oa_intervals()", "🔄 Get available intervals - AUTO FORMAT"],
-        ["Account", "oa_funds()", "🔄 Get account funds - AUTO FORMAT"],
-        ["Account", "oa_orderbook()", "🔄 Get order book - AUTO FORMAT"],
-        ["Account", "oa_tradebook()", "🔄 Get trade book - AUTO FORMAT"],
-        ["Account", "oa_positionbook()", "🔄 Get position book - AUTO FORMAT"],
-        ["Account", "oa_holdings()", "🔄 Get holdings - AUTO FORMAT"],
-        ["Orders", "oa_placeorder(...)", "Place order"],
-        ["Orders", "oa_modifyorder(...)", "Modify order"],
-        ["Orders", "oa_cancelorder(strategy, order_id)", "Cancel order"],
-        ["Orders", "oa_orderstatus(strategy, order_id)", "Get order status"],
-        ["Help", "oa_all_functions()", "This enhanced function list"],
-        ["Help", "oa_test_connection()", "Test API connection"],
-        ["", "", ""],
-        ["🆕 NEW FEATURES", "", ""],
-        ["Dynamic Formatting", "All functions auto-adapt", "Handles list/dict format changes"],
-        ["Smart Field Ordering", "Important fields first", "Symbol, price, quantity prioritized"],
-        ["Price Formatting", "Auto currency format", "Prices show as 123.45"],
-        ["Timestamp Conversion", "Readable dates", "Unix timestamps → 2024-06-22 14:30:00"],
-        ["Field Labels", "User-friendly names", "ltp → Last Trade Price"],
-        ["Error Handling", "Clear error messages", "Better validation and feedback"]
-    ]
+    return ALL_FUNCTIONS_TABLE
+
+def run_connection_test(api_key):
+    """Check connectivity against the funds endpoint and record the result"""
+    host_url = OpenAlgoConfig.host_url
+    try:
+        # A cached funds response would report success without contacting the server
+        response = post_request(OpenAlgoConfig.url("funds"), {"apikey": api_key}, use_cache=False)
+        
+        if "error" in response:
+            result = [
+                ["Connection Test", "FAILED"],
+                ["Error", response["error"]],
+                ["Host", host_url]
+            ]
+        else:
+            result = [
+                ["Connection Test", "SUCCESS"],
+                ["Host", host_url],
+                ["Version", OpenAlgoConfig.version]
+            ]
+            
+    except Exception as e:
+        result = [
+            ["Connection Test", "FAILED"],
+            ["Error", str(e)]
+        ]
+    
+    _CONNECTION_TEST.update(result=result, host_url=host_url, checked_at=time.monotonic())
+    return result
 
 @func(help_url="https://docs.openalgo.in/api-documentation/v1")
 def oa_test_connection():
@@ -1568,6 +2750,9 @@ def oa_test_connection():
     
     Verifies that your API key is valid and the OpenAlgo server is reachable.
     Run this after setting up oa_api() to confirm everything is working.
+    The check runs in the background so Excel never waits on the network:
+    the first call returns PENDING and later calls return the latest result,
+    which is reused for 30 seconds.
     
     Returns:
         Connection test results with status and error details
@@ -1577,33 +2762,30 @@ def oa_test_connection():
         
     Note: Run this first to verify setup before using trading functions
     """
-    if not validate_api_key():
-        return format_error("OpenAlgo API Key is not set. Use oa_api()")
+    api_key = validate_api_key()
+    if not api_key:
+        return API_KEY_MISSING_ERROR
     
-    try:
-        endpoint = f"{OpenAlgoConfig.host_url}/api/{OpenAlgoConfig.version}/funds"
-        payload = {"apikey": OpenAlgoConfig.api_key}
-        
-        response = post_request(endpoint, payload)
-        
-        if "error" in response:
-            return [
-                ["Connection Test", "FAILED"],
-                ["Error", response["error"]],
-                ["Host", OpenAlgoConfig.host_url]
-            ]
-        else:
-            return [
-                ["Connection Test", "SUCCESS"],
-                ["Host", OpenAlgoConfig.host_url],
-                ["Version", OpenAlgoConfig.version]
-            ]
-            
-    except Exception as e:
-        return [
-            ["Connection Test", "FAILED"],
-            ["Error", str(e)]
-        ]
+    state = _CONNECTION_TEST
+    has_result = state["result"] is not None and state["host_url"] == OpenAlgoConfig.host_url
+    if has_result and time.monotonic() - state["checked_at"] < 30:
+        return state["result"]
+    
+    pool = get_worker_pool()
+    if pool is None:
+        return run_connection_test(api_key)
+    
+    future = state["future"]
+    if future is None or future.done():
+        state["future"] = pool.submit(run_connection_test, api_key)
+    
+    if has_result:
+        return state["result"]
+    return [
+        ["Connection Test", "PENDING"],
+        ["Host", OpenAlgoConfig.host_url],
+        ["Note", "Recalculate to see the result"]
+    ]
 
 @func(help_url="https://docs.openalgo.in/api-documentation/v1/data-api/history")
 @arg("symbol", doc='Trading symbol (e.g., "RELIANCE", "NIFTY50")')
@@ -1611,7 +2793,7 @@ def oa_test_connection():
 @arg("interval", doc='Time interval: "1m", "5m", "15m", "30m", "1h", "4h", "1d", "1w", "1M"')
 @arg("start_date", doc='Start date in YYYY-MM-DD format (e.g., "2024-01-01")')
 @arg("end_date", doc='End date in YYYY-MM-DD format (e.g., "2024-01-31")')
-def oa_history(symbol, exchange, interval, start_date, end_date):
+async def oa_history(symbol, exchange, interval, start_date, end_date):
     """Get historical OHLCV data for charting and analysis
     
     Retrieves historical price data with Open, High, Low, Close, and Volume
@@ -1634,20 +2816,21 @@ def oa_history(symbol, exchange, interval, start_date, end_date):
         
     Note: Use oa_intervals() to see all available time intervals
     """
-    if not validate_api_key():
-        return format_error("OpenAlgo API Key is not set. Use oa_api()")
+    api_key = validate_api_key()
+    if not api_key:
+        return API_KEY_MISSING_ERROR
     
-    endpoint = f"{OpenAlgoConfig.host_url}/api/{OpenAlgoConfig.version}/history"
+    endpoint = OpenAlgoConfig.url("history")
     payload = {
-        "apikey": OpenAlgoConfig.api_key,
-        "symbol": str(symbol),
-        "exchange": str(exchange),
-        "interval": str(interval),
-        "start_date": str(start_date),
-        "end_date": str(end_date)
+        "apikey": api_key,
+        "symbol": _to_str(symbol),
+        "exchange": _to_str(exchange),
+        "interval": _to_str(interval),
+        "start_date": _to_str(start_date),
+        "end_date": _to_str(end_date)
     }
     
-    response = post_request(endpoint, payload)
+    response = await post_request_async(endpoint, payload)
     
     # For historical data, we need special handling to include symbol and split timestamp
     if "error" in response:
@@ -1660,35 +2843,29 @@ def oa_history(symbol, exchange, interval, start_date, end_date):
     # Historical data needs special formatting with symbol and split timestamp
     result = [["Ticker", "Date", "Time", "Open", "High", "Low", "Close", "Volume"]]
     
+    ticker = _to_str(symbol)
+    fromtimestamp = datetime.fromtimestamp
+    open_fmt, high_fmt, low_fmt, close_fmt = map(resolve_formatter, ("open", "high", "low", "close"))
+    
     for item in data:
-        # Convert timestamp to IST date and time
+        # Convert timestamp to IST date and time (f-strings are cheaper than strftime)
         try:
-            timestamp = item.get("timestamp", 0)
-            dt = datetime.fromtimestamp(timestamp)
-            date_str = dt.strftime('%Y-%m-%d')
-            time_str = dt.strftime('%H:%M:%S')
+            dt = fromtimestamp(item.get("timestamp", 0))
+            date_str = f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
+            time_str = f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
         except (ValueError, TypeError, OSError):
             date_str = "N/A"
             time_str = "N/A"
         
         result.append([
-            str(symbol),
+            ticker,
             date_str,
             time_str,
-            smart_format_value("open", item.get("open", "")),
-            smart_format_value("high", item.get("high", "")),
-            smart_format_value("low", item.get("low", "")),
-            smart_format_value("close", item.get("close", "")),
+            format_cell(open_fmt, item.get("open", "")),
+            format_cell(high_fmt, item.get("high", "")),
+            format_cell(low_fmt, item.get("low", "")),
+            format_cell(close_fmt, item.get("close", "")),
             str(item.get("volume", ""))
         ])
     
     return result
-
-
-# Order Management Functions (still using manual formatting for complex order responses)
-def handle_optional_param(param, default="0"):
-    """Handle Excel optional parameters - convert None to default"""
-    if param is None or param == "":
-        return default
-    return str(param)
-
@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+xlwings = pytest.importorskip("xlwings")
+if not hasattr(xlwings, "script"):
+    pytest.skip("main.py needs the xlwings Lite API", allow_module_level=True)
+
+import main  # noqa: E402
+
+QUOTE = {"status": "success", "data": {"ltp": 100.5}}
+
+
+@pytest.fixture(autouse=True)
+def configured(monkeypatch):
+    monkeypatch.setattr(main.OpenAlgoConfig, "api_key", "test-key")
+    monkeypatch.setattr(main.OpenAlgoConfig, "quote_ttl", 60.0)
+    main.OpenAlgoConfig._endpoints.clear()
+    main.oa_cache_clear()
+    yield
+    main.oa_cache_clear()
+
+
+def cache_counts():
+    rows = dict(main.oa_cache_stats()[1:])
+    return rows["Hits"], rows["Misses"]
+
+
+def test_quote_miss_then_hit_counts_once_each(monkeypatch):
+    requests = []
+
+    async def fake_post(endpoint, payload):
+        requests.append(endpoint)
+        return QUOTE
+
+    monkeypatch.setattr(main, "post_request_async", fake_post)
+
+    asyncio.run(main.oa_quotes("RELIANCE", "NSE"))
+    asyncio.run(main.oa_quotes("RELIANCE", "NSE"))
+
+    assert len(requests) == 1
+    assert cache_counts() == (1, 1)
+
+
+def test_quotes_batch_counts_each_symbol_once(monkeypatch):
+    requests = []
+
+    async def fake_send(endpoint, payload):
+        requests.append(endpoint.rsplit("/", 1)[-1])
+        return {"status": "success", "results": [
+            {"symbol": item["symbol"], "exchange": item["exchange"], "data": QUOTE["data"]}
+            for item in payload["symbols"]
+        ]}
+
+    monkeypatch.setattr(main, "send_request_async", fake_send)
+
+    asyncio.run(main.oa_quotes_batch([["RELIANCE"], ["INFY"]], "NSE"))
+    asyncio.run(main.oa_quotes_batch([["RELIANCE"], ["INFY"]], "NSE"))
+
+    assert requests == ["multiquotes"]
+    assert cache_counts() == (2, 2)
@@ -0,0 +1,15 @@
+import pytest
+
+xlwings = pytest.importorskip("xlwings")
+if not hasattr(xlwings, "script"):
+    pytest.skip("main.py needs the xlwings Lite API", allow_module_level=True)
+
+import main  # noqa: E402
+
+
+def test_numeric_scrip_codes_are_sent_without_decimals():
+    assert main.flatten_range([[500325.0], ["RELIANCE "], [None], [12.5]]) == ["500325", "RELIANCE", "12.5"]
+
+
+def test_blank_cells_are_kept_when_requested():
+    assert main.flatten_range([[500325.0], [None]], keep_blank=True) == ["500325", ""]
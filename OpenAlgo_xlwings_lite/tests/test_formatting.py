@@ -0,0 +1,108 @@
+from datetime import datetime
+
+import pytest
+
+xlwings = pytest.importorskip("xlwings")
+if not hasattr(xlwings, "script"):
+    pytest.skip("main.py needs the xlwings Lite API", allow_module_level=True)
+
+import main  # noqa: E402
+
+# (field, value, output of smart_format_value before formatters were resolved per field)
+BASELINE = [
+    ('ltp', 2500.5, '2500.50'),
+    ('ltp', 0, '0.00'),
+    ('ltp', -0.0, '0.00'),
+    ('ltp', '101.456', '101.46'),
+    ('LTP', 99, '99.00'),
+    ('ltp', 'n/a', 'n/a'),
+    ('close', -3.14159, '-3.14'),
+    ('availablecash', 9999.994, '9999.99'),
+    ('availablecash', 10000, '10,000.00'),
+    ('availablecash', 1234567.891, '1,234,567.89'),
+    ('collateral', 0.0, '0.00'),
+    ('payout', '25000.5', '25,000.50'),
+    ('exposure', -15000.0, '-15000.00'),
+    ('turnover', 'abc', 'abc'),
+    ('quantity', 999, '999'),
+    ('quantity', 1000, '1,000'),
+    ('volume', 1234567.9, '1,234,567'),
+    ('quantity', '1500', '1,500'),
+    ('lot_size', -2500, '-2500'),
+    ('volume', 'x', 'x'),
+    ('change_percent', 1.234, '1.23%'),
+    ('pnl_percent', -0.5, '-0.50%'),
+    ('return_pct', 12, '12.00%'),
+    ('implied_volatility', '18.456', '18.46%'),
+    ('day_change_percent', 'up', 'up'),
+    ('delta', 0.52345, '0.5234'),
+    ('gamma', 0, '0.0000'),
+    ('theta', '-12.3456789', '-12.3457'),
+    ('vega', 'n/a', 'n/a'),
+    ('days_to_expiry', 7.9, '7'),
+    ('bid_orders', '12', '12'),
+    ('multiplier', 'x', 'x'),
+    ('expiry', '2024-03-28', '2024-03-28'),
+    ('expiry', '20240328', '2024-03-28'),
+    ('expiry', '28MAR24', '28MAR24'),
+    ('expiry_date', '20240328', '2024-03-28'),
+    ('ltp', None, ''),
+    ('ltp', '', ''),
+    ('timestamp', None, ''),
+    ('symbol', 'RELIANCE', 'RELIANCE'),
+    ('status', 'complete', 'complete'),
+    ('exchange', 'NSE', 'NSE'),
+    ('orderid', 250101000123456, '250101000123456'),
+    ('timestamp', '2024-01-01 09:15:00', '2024-01-01 09:15:00'),
+    ('price', True, '1.00'),
+]
+
+TIMESTAMPS = [0, 1704080700, 1704080700.75]
+
+
+def baseline_timestamp(value):
+    return datetime.fromtimestamp(value).strftime(main.ResponseConfig.timestamp_format)
+
+
+@pytest.mark.parametrize("field, value, expected", BASELINE)
+def test_format_cell_matches_baseline(field, value, expected):
+    assert main.format_cell(main.resolve_formatter(field), value) == expected
+    assert main.smart_format_value(field, value) == expected
+
+
+@pytest.mark.parametrize("value", TIMESTAMPS)
+def test_timestamp_matches_baseline(value):
+    assert main.smart_format_value("timestamp", value) == baseline_timestamp(value)
+    assert main.smart_format_value("order_time", value) == baseline_timestamp(value)
+
+
+def numeric_columns():
+    """Numeric baseline cases per lowercase field, which take the column path in large tables"""
+    columns = {}
+    for field, value, expected in BASELINE:
+        if field.islower() and value.__class__ in (int, float):
+            columns.setdefault(field, []).append((value, expected))
+    columns["timestamp"] = [(value, baseline_timestamp(value)) for value in TIMESTAMPS]
+    return columns
+
+
+@pytest.mark.parametrize("rows", [10, main.COLUMN_FORMAT_MIN_ROWS, main.COLUMN_FORMAT_MIN_ROWS + 100])
+def test_table_matches_baseline(rows):
+    columns = numeric_columns()
+    text = [(value, expected) for field, value, expected in BASELINE if field == "ltp" and value.__class__ is str]
+    data = []
+    for i in range(rows):
+        item = {field: cases[i % len(cases)][0] for field, cases in columns.items()}
+        item["ltp"] = text[i % len(text)][0] if i % 7 == 0 else item["ltp"]  # Mixed column stays per cell
+        data.append(item)
+
+    table = main.format_table_data(data, "orderbook")
+
+    headers = table[0]
+    for i, row in enumerate(table[1:]):
+        cells = dict(zip(headers, row))
+        for field, cases in columns.items():
+            expected = cases[i % len(cases)][1]
+            if field == "ltp" and i % 7 == 0:
+                expected = text[i % len(text)][1]
+            assert cells[main.get_display_label(field)] == expected, (i, field)
@@ -0,0 +1,84 @@
+import http.client
+import urllib.error
+
+import pytest
+
+xlwings = pytest.importorskip("xlwings")
+if not hasattr(xlwings, "script"):
+    pytest.skip("main.py needs the xlwings Lite API", allow_module_level=True)
+
+import main  # noqa: E402
+
+ORDER = {"apikey": "test-key", "symbol": "RELIANCE", "exchange": "NSE", "action": "BUY", "quantity": 1}
+
+
+class FakeResponse:
+    status = 200
+    reason = "OK"
+    headers = {}
+    will_close = False
+
+    def __init__(self, body):
+        self.body = body
+
+    def read(self):
+        if isinstance(self.body, Exception):
+            raise self.body
+        return self.body
+
+    def getheader(self, name, default=None):
+        return default
+
+
+class FakeConnection:
+    def __init__(self, body):
+        self.body = body
+        self.sock = type("sock", (), {"settimeout": lambda self, timeout: None})()
+
+    def request(self, method, path, body=None, headers=None):
+        self.requests.append(path)
+
+    def getresponse(self):
+        return FakeResponse(self.body)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Route pooled connections to fake connections answering with the given body"""
+    sent = []
+
+    def connect(body):
+        def open_connection(scheme, netloc, timeout):
+            conn = FakeConnection(body)
+            conn.requests = sent
+            return conn
+        monkeypatch.setattr(main, "PYODIDE_AVAILABLE", False)
+        monkeypatch.setattr(main, "open_connection", open_connection)
+        main.close_idle_connections()
+        return sent
+
+    yield connect
+    main.close_idle_connections()
+
+
+@pytest.mark.parametrize("body", [
+    http.client.IncompleteRead(b'{"status"'),
+    b"<html>Bad Gateway</html>",
+])
+def test_order_failing_mid_response_is_sent_once(server, body):
+    sent = server(body)
+
+    with pytest.raises(Exception):
+        main.post_request_with_fallback("https://broker.example/api/v1/placeorder", dict(ORDER))
+
+    assert sent == ["/api/v1/placeorder"]
+
+
+def test_http_protocol_error_is_raised_as_url_error(server):
+    server(http.client.IncompleteRead(b""))
+
+    with pytest.raises(urllib.error.URLError):
+        main.post_request_with_fallback("http://127.0.0.1:5000/api/v1/placeorder", dict(ORDER))
@@ -0,0 +1,56 @@
+import socket
+import ssl
+import urllib.error
+
+import pytest
+
+xlwings = pytest.importorskip("xlwings")
+if not hasattr(xlwings, "script"):
+    pytest.skip("main.py needs the xlwings Lite API", allow_module_level=True)
+
+import main  # noqa: E402
+
+ENDPOINT = "https://broker.example/api/v1/funds"
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Stub send_post; HTTPS requests raise the given error, HTTP requests succeed"""
+    attempts = []
+
+    def connect(error):
+        def fake_send(endpoint, payload):
+            attempts.append(endpoint.split(":", 1)[0])
+            if endpoint.startswith("https://"):
+                raise error
+            return {"status": "success"}
+        monkeypatch.setattr(main, "send_post", fake_send)
+        return attempts
+
+    return connect
+
+
+@pytest.mark.parametrize("error", [
+    urllib.error.URLError(ConnectionRefusedError(111, "Connection refused")),
+    urllib.error.URLError(socket.timeout("timed out")),
+    TimeoutError("timed out"),
+    ConnectionRefusedError(111, "Connection refused"),
+])
+def test_unreachable_host_is_not_retried_over_http(server, error):
+    attempts = server(error)
+
+    with pytest.raises(type(error)):
+        main.post_request_with_fallback(ENDPOINT, {"apikey": "test-key"})
+
+    assert attempts == ["https"]
+
+
+@pytest.mark.parametrize("error", [
+    urllib.error.URLError("unknown url type: https"),
+    ssl.SSLError("certificate verify failed"),
+])
+def test_https_failure_falls_back_to_http(server, error):
+    attempts = server(error)
+
+    assert main.post_request_with_fallback(ENDPOINT, {"apikey": "test-key"}) == {"status": "success"}
+    assert attempts == ["https", "http"]
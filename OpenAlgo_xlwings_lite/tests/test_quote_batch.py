@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+xlwings = pytest.importorskip("xlwings")
+if not hasattr(xlwings, "script"):
+    pytest.skip("main.py needs the xlwings Lite API", allow_module_level=True)
+
+import main  # noqa: E402
+
+NOT_FOUND = {"error": "HTTP Error 404: NOT FOUND"}
+
+
+def quote(symbol):
+    return {"ltp": float(len(symbol))}
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Stub send_request_async; multiquotes answers for every symbol not in skipped"""
+    monkeypatch.setattr(main.QuoteBatch, "multiquotes_supported", True)
+    monkeypatch.setattr(main.QuoteBatch, "pending", [])
+    monkeypatch.setattr(main.QuoteBatch, "flush_handle", None)
+    requests = []
+    skipped = set()
+    supported = [True]
+
+    async def fake_send(endpoint, payload):
+        route = endpoint.rsplit("/", 1)[-1]
+        if route == "multiquotes":
+            requests.append((route, sorted(item["symbol"] for item in payload["symbols"])))
+            if not supported[0]:
+                return NOT_FOUND
+            return {"status": "success", "results": [
+                {"symbol": item["symbol"], "exchange": item["exchange"], "data": quote(item["symbol"])}
+                for item in payload["symbols"] if item["symbol"] not in skipped
+            ]}
+        requests.append((route, payload["symbol"]))
+        return {"status": "success", "data": quote(payload["symbol"])}
+
+    monkeypatch.setattr(main, "send_request_async", fake_send)
+    return requests, skipped, supported
+
+
+def recalc(*symbols):
+    """Request quotes for several cells at once, as one Excel recalc would"""
+    endpoint = main.OpenAlgoConfig.url("quotes")
+
+    async def run():
+        return await asyncio.gather(*(
+            main.post_request_async(endpoint, {"apikey": "test-key", "symbol": symbol, "exchange": "NSE"})
+            for symbol in symbols
+        ))
+
+    return asyncio.run(run())
+
+
+def test_concurrent_quotes_share_one_multiquotes_request(server):
+    requests, _, _ = server
+
+    responses = recalc("RELIANCE", "INFY", "RELIANCE")
+
+    assert requests == [("multiquotes", ["INFY", "RELIANCE"])]
+    assert [response["data"] for response in responses] == [quote("RELIANCE"), quote("INFY"), quote("RELIANCE")]
+
+
+def test_symbols_missing_from_multiquotes_are_fetched_singly(server):
+    requests, skipped, _ = server
+    skipped.add("INFY")
+
+    responses = recalc("RELIANCE", "INFY")
+
+    assert requests == [("multiquotes", ["INFY", "RELIANCE"]), ("quotes", "INFY")]
+    assert responses[1] == {"status": "success", "data": quote("INFY")}
+
+
+def test_server_without_multiquotes_falls_back_to_single_requests(server):
+    requests, _, supported = server
+    supported[0] = False
+
+    first = recalc("RELIANCE", "INFY")
+    second = recalc("TCS", "SBIN")
+
+    assert not main.QuoteBatch.multiquotes_supported
+    assert requests == [
+        ("multiquotes", ["INFY", "RELIANCE"]), ("quotes", "RELIANCE"), ("quotes", "INFY"),
+        ("quotes", "TCS"), ("quotes", "SBIN"),
+    ]
+    assert [response["data"] for response in first + second] == [quote(s) for s in ("RELIANCE", "INFY", "TCS", "SBIN")]
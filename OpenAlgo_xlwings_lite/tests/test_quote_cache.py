@@ -0,0 +1,103 @@
+import asyncio
+import time
+
+import pytest
+
+xlwings = pytest.importorskip("xlwings")
+if not hasattr(xlwings, "script"):
+    pytest.skip("main.py needs the xlwings Lite API", allow_module_level=True)
+
+import main  # noqa: E402
+
+ENDPOINT = "http://127.0.0.1:5000/api/v1/quotes"
+PAYLOAD = {"apikey": "test-key", "symbol": "RELIANCE", "exchange": "NSE"}
+KEY = (ENDPOINT, "RELIANCE", "NSE")
+CACHED = {"status": "success", "data": {"ltp": 100.0}}
+FRESH = {"status": "success", "data": {"ltp": 101.0}}
+
+
+@pytest.fixture(autouse=True)
+def configured(monkeypatch):
+    monkeypatch.setattr(main.OpenAlgoConfig, "quote_ttl", 1.0)
+    main.oa_cache_clear()
+    yield
+    main.oa_cache_clear()
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Stub post_request_async, recording each request and answering with FRESH"""
+    requests = []
+
+    async def fake_post(endpoint, payload):
+        requests.append(payload["symbol"])
+        await asyncio.sleep(0.01)
+        return FRESH
+
+    monkeypatch.setattr(main, "post_request_async", fake_post)
+    return requests
+
+
+def cache_entry(age):
+    main._QUOTE_CACHE[KEY] = (time.monotonic() - age, CACHED)
+
+
+async def request_and_settle():
+    """Request the quote, then let any background refresh finish"""
+    response = await main.cached_market_data_request(ENDPOINT, dict(PAYLOAD))
+    while main._QUOTE_REFRESHING:
+        await asyncio.sleep(0.01)
+    return response
+
+
+def test_fresh_entry_is_served_without_request(server):
+    cache_entry(age=0.5)
+
+    assert asyncio.run(request_and_settle()) == CACHED
+    assert server == []
+
+
+def test_stale_entry_is_served_while_refreshing(server):
+    cache_entry(age=2.0)
+
+    assert asyncio.run(request_and_settle()) == CACHED
+    assert server == ["RELIANCE"]
+    assert main._QUOTE_CACHE[KEY][1] == FRESH
+
+
+def test_expired_entry_waits_for_refresh(server):
+    cache_entry(age=10.0)
+
+    assert asyncio.run(request_and_settle()) == FRESH
+    assert server == ["RELIANCE"]
+
+
+def test_concurrent_cells_share_one_refresh(server):
+    async def recalc():
+        return await asyncio.gather(*(main.cached_market_data_request(ENDPOINT, dict(PAYLOAD)) for _ in range(5)))
+
+    assert asyncio.run(recalc()) == [FRESH] * 5
+    assert server == ["RELIANCE"]
+    assert main._QUOTE_REFRESHING == {}
+
+
+def test_failed_refresh_is_not_left_pending(monkeypatch):
+    async def failing_post(endpoint, payload):
+        raise ConnectionError("server down")
+
+    monkeypatch.setattr(main, "post_request_async", failing_post)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(main.cached_market_data_request(ENDPOINT, dict(PAYLOAD)))
+    assert main._QUOTE_REFRESHING == {}
+    assert KEY not in main._QUOTE_CACHE
+
+
+def test_error_response_is_not_cached(monkeypatch):
+    async def error_post(endpoint, payload):
+        return {"error": "HTTP Error 500: Internal Server Error"}
+
+    monkeypatch.setattr(main, "post_request_async", error_post)
+    assert "error" in asyncio.run(main.cached_market_data_request(ENDPOINT, dict(PAYLOAD)))
+    assert main._QUOTE_REFRESHING == {}
+    assert KEY not in main._QUOTE_CACHE
@@ -0,0 +1,105 @@
+import json
+
+import pytest
+
+xlwings = pytest.importorskip("xlwings")
+if not hasattr(xlwings, "script"):
+    pytest.skip("main.py needs the xlwings Lite API", allow_module_level=True)
+
+import main  # noqa: E402
+
+
+class FakeSocket:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, text):
+        self.sent.append(json.loads(text))
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def socket():
+    fake = FakeSocket()
+    main.stop_quote_stream()
+    main.QuoteStream.socket = fake
+    yield fake
+    main.stop_quote_stream()
+
+
+def test_subscribe_waits_for_authentication(socket):
+    assert main.streamed_quote("RELIANCE", "NSE") is None
+    assert socket.sent == []
+
+    main.handle_stream_message('{"type": "auth", "status": "success"}')
+
+    assert socket.sent == [{"action": "subscribe", "symbol": "RELIANCE", "exchange": "NSE", "mode": 2}]
+
+
+def test_tick_is_served_as_quote(socket):
+    main.handle_stream_message('{"type": "auth", "status": "success"}')
+    main.streamed_quote("RELIANCE", "NSE")
+
+    main.handle_stream_message(json.dumps({
+        "type": "market_data", "symbol": "RELIANCE", "exchange": "NSE", "data": {"ltp": 2500.5}
+    }))
+
+    assert main.streamed_quote("RELIANCE", "NSE") == {"status": "success", "data": {"ltp": 2500.5}}
+
+
+def test_least_recently_read_symbol_is_unsubscribed(socket):
+    main.handle_stream_message('{"type": "auth", "status": "success"}')
+    limit = main.QuoteStream.max_symbols
+    for i in range(limit):
+        main.streamed_quote(f"SYM{i}", "NSE")
+    main.streamed_quote("SYM0", "NSE")  # Read again, so SYM1 is now the oldest
+
+    main.streamed_quote("EXTRA", "NSE")
+
+    assert len(main.QuoteStream.subscribed) == limit
+    assert ("SYM1", "NSE") not in main.QuoteStream.subscribed
+    assert ("SYM0", "NSE") in main.QuoteStream.subscribed
+    assert socket.sent[-2:] == [
+        {"action": "unsubscribe", "symbol": "SYM1", "exchange": "NSE", "mode": 2},
+        {"action": "subscribe", "symbol": "EXTRA", "exchange": "NSE", "mode": 2},
+    ]
+
+
+def test_old_tick_falls_back_to_http(socket, monkeypatch):
+    main.handle_stream_message('{"type": "auth", "status": "success"}')
+    main.streamed_quote("RELIANCE", "NSE")
+    main.handle_stream_message(json.dumps({
+        "type": "market_data", "symbol": "RELIANCE", "exchange": "NSE", "data": {"ltp": 2500.5}
+    }))
+
+    received = main.time.monotonic()
+    monkeypatch.setattr(main.time, "monotonic", lambda: received + main.QuoteStream.max_age)
+
+    assert main.streamed_quote("RELIANCE", "NSE") is None
+
+
+class FakeWebSocketApp(FakeSocket):
+    def __init__(self, url, on_open, on_message, on_close):
+        super().__init__()
+        self.on_open, self.on_message, self.on_close = on_open, on_message, on_close
+
+    def run_forever(self):
+        pass
+
+
+def test_closed_stream_stops_queueing_subscriptions(monkeypatch):
+    monkeypatch.setattr(main, "JS_WEBSOCKET_AVAILABLE", False)
+    monkeypatch.setattr(main, "websocket", type("websocket", (), {"WebSocketApp": FakeWebSocketApp}), raising=False)
+    main.start_quote_stream("ws://127.0.0.1:8765", "test-key")
+    app = main.QuoteStream.socket
+    main.streamed_quote("RELIANCE", "NSE")
+
+    app.on_close(app, None, None)
+
+    assert main.QuoteStream.socket is None
+    assert main.QuoteStream.unsent == []
+    assert main.QuoteStream.subscribed == {}
+    assert main.streamed_quote("INFY", "NSE") is None
+    assert main.QuoteStream.unsent == []
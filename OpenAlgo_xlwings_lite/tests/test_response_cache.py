@@ -0,0 +1,57 @@
+import pytest
+
+xlwings = pytest.importorskip("xlwings")
+if not hasattr(xlwings, "script"):
+    pytest.skip("main.py needs the xlwings Lite API", allow_module_level=True)
+
+import main  # noqa: E402
+
+FUNDS = "http://127.0.0.1:5000/api/v1/funds"
+HISTORY = "http://127.0.0.1:5000/api/v1/history"
+
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    """Replace the monotonic clock with one the test advances by hand"""
+    now = [1000.0]
+    monkeypatch.setattr(main.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(main.ResponseCache, "max_entries", 3)
+    main.oa_cache_clear()
+    yield now
+    main.oa_cache_clear()
+
+
+def history(symbol):
+    return {"apikey": "test-key", "symbol": symbol}
+
+
+def test_recently_read_entry_survives_eviction():
+    for symbol in ("A", "B", "C"):
+        main.store_response_cache(HISTORY, history(symbol), symbol)
+    assert main.lookup_response_cache(HISTORY, history("A")) == "A"
+
+    main.store_response_cache(HISTORY, history("D"), "D")
+
+    assert main.lookup_response_cache(HISTORY, history("A")) == "A"
+    assert main.lookup_response_cache(HISTORY, history("B")) is None
+
+
+def test_expired_entries_are_evicted_before_live_ones(clock):
+    main.store_response_cache(HISTORY, history("A"), "A")
+    main.store_response_cache(FUNDS, {"apikey": "test-key"}, "funds")
+    main.store_response_cache(HISTORY, history("B"), "B")
+    clock[0] += main.ResponseCache.ttl["funds"]
+
+    main.store_response_cache(HISTORY, history("C"), "C")
+
+    assert main.lookup_response_cache(HISTORY, history("A")) == "A"
+    assert main.lookup_response_cache(HISTORY, history("B")) == "B"
+    assert main.lookup_response_cache(HISTORY, history("C")) == "C"
+
+
+def test_expired_entry_is_dropped_on_lookup(clock):
+    main.store_response_cache(FUNDS, {"apikey": "test-key"}, "funds")
+    clock[0] += main.ResponseCache.ttl["funds"]
+
+    assert main.lookup_response_cache(FUNDS, {"apikey": "test-key"}) is None
+    assert len(main.ResponseCache.entries) == 0